@@ -0,0 +1,189 @@
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+# Runs the eps.upload.py, stock.py, manage.py and orders.sync.py flows against
+# the offline eBay stand-in (mock_ebay.py) for synthetic catalogs of 10, 100
+# and 1,000 SKUs and reports wall time, throughput, API calls, 429s and the
+# server-side response times of each flow.
+#   python3 benchmarks/api.py [--sizes 10,100,1000] [--latency 0.05] [--throttle 0.0] [--rate-limit N] [--photos 3]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from mock_ebay import MockEbay, PHOTO_BUCKET, start_server
+
+CATEGORY = 'diecast'
+SOLD_SHARE = 0.1  # SKUs sold between the reprice and the order sync
+WORKERS = 8
+
+# Runs a script as __main__ with the benchmark's ebay_config.py ahead of any
+# real one next to the scripts
+RUNNER = "import runpy, sys; sys.path[:0] = [{workdir!r}, {root!r}]; sys.argv = [{script!r}] + {args!r}; runpy.run_path({path!r}, run_name='__main__')"
+
+# eps.upload.py handles one product per run; this loops over the products in
+# one process, like the pipeline's EPS stage, so interpreter start-up is not timed
+EPS_DRIVER = """
+import importlib.util, sys
+sys.path[:0] = [{workdir!r}, {root!r}]
+spec = importlib.util.spec_from_file_location('eps_upload', {path!r})
+eps = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(eps)
+failed = 0
+for product_id in {product_ids!r}:
+    with open(f"s3.{category}.{{product_id}}.urls.txt") as f:
+        urls = [line.strip() for line in f if line.strip()]
+    rows = eps.write_eps_csv(urls, eps.eps_csv_name({category!r}, product_id, eps.ENV), {workers!r})
+    failed += sum(1 for _, ebay_url, _ in rows if not ebay_url)
+sys.exit(1 if failed else 0)
+"""
+
+def synthetic_catalog(size):
+    product_ids = [str(i).zfill(4) for i in range(1, size + 1)]
+    df = pd.DataFrame({
+        'id': product_ids,
+        'price': [round(19.99 + (i % 20) * 5, 2) for i in range(size)],
+        'lbs': 1, 'oz': 4, 'l': 11, 'w': 5, 'h': 4,
+        'scale': '1:24',
+        'driver': ['Jeff Gordon', 'Dale Earnhardt', 'Jimmie Johnson', 'Kyle Busch'] * (size // 4) + ['Tony Stewart'] * (size % 4),
+        'model': 'Monte Carlo',
+        'year': 2001,
+        'edition': 'Elite',
+        'type': 'Stock Car',
+        'autographed': False
+    })
+    return product_ids, df
+
+def prepare_workdir(workdir, base_url, product_ids, df, photos):
+    shutil.copy(os.path.join(ROOT, 'ebay_config_template.py'), os.path.join(workdir, 'ebay_config.py'))
+    df.to_excel(os.path.join(workdir, 'products.xlsx'), index=False)
+    repriced = df.copy()
+    repriced.loc[repriced.index % 2 == 0, 'price'] += 5
+    repriced.to_excel(os.path.join(workdir, 'repriced.xlsx'), index=False)
+    for product_id in product_ids:
+        with open(os.path.join(workdir, f"s3.{CATEGORY}.{product_id}.urls.txt"), 'w') as f:
+            f.write(''.join(f"{base_url}/{PHOTO_BUCKET}/{CATEGORY}/{product_id}/{n}.jpg\n" for n in range(1, photos + 1)))
+        with open(os.path.join(workdir, f"{CATEGORY}.listing.{product_id}.html"), 'w') as f:
+            f.write(f"<html><head><title>NASCAR Diecast {product_id}</title></head><body><p>Diecast {product_id}</p></body></html>")
+
+def run_flow(workdir, base_url, code):
+    env = dict(os.environ, EBAY_API_BASE_URL=base_url, EBAY_AUTOMATION_CACHE_DIR=os.path.join(workdir, '.cache'))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+def script_code(workdir, script, *args):
+    return RUNNER.format(workdir=workdir, root=ROOT, script=script, args=list(args), path=os.path.join(ROOT, script))
+
+def flows(workdir, product_ids):
+    eps_code = EPS_DRIVER.format(workdir=workdir, root=ROOT, path=os.path.join(ROOT, 'eps.upload.py'),
+                                 product_ids=product_ids, category=CATEGORY, workers=4)
+    id_spec = f"{product_ids[0]}-{product_ids[-1]}"
+    workers = ['--workers', str(WORKERS)]
+    return [
+        ('eps upload', eps_code, None),
+        ('eps upload (cached)', eps_code, None),
+        ('stock batch --publish', script_code(workdir, 'stock.py', 'batch', 'products.xlsx', id_spec, '--publish'), None),
+        ('stock batch (unchanged)', script_code(workdir, 'stock.py', 'batch', 'products.xlsx', id_spec, '--publish'), None),
+        ('manage status all', script_code(workdir, 'manage.py', 'status', 'all'), None),
+        ('manage reprice', script_code(workdir, 'manage.py', 'reprice', 'repriced.xlsx', id_spec), None),
+        ('orders sync', script_code(workdir, 'orders.sync.py'), 'sell'),
+        ('manage end', script_code(workdir, 'manage.py', 'end', id_spec, *workers), None),
+        ('manage delete', script_code(workdir, 'manage.py', 'delete', id_spec, *workers), None)
+    ]
+
+def run_size(size, options):
+    product_ids, df = synthetic_catalog(size)
+    mock = MockEbay(options['latency'], options['throttle'], options['rate_limit'], seed=size)
+    server = start_server(mock, port=0)
+    rows = []
+    workdir = tempfile.mkdtemp(prefix=f"ebay.bench.{size}.")
+    try:
+        prepare_workdir(workdir, mock.base_url, product_ids, df, options['photos'])
+        for name, code, setup in flows(workdir, product_ids):
+            if setup == 'sell':
+                with mock.lock:
+                    for product_id in product_ids[::int(1 / SOLD_SHARE)]:
+                        mock.sell(f"DIECAST-{product_id}")
+            before = mock.stats()
+            with mock.lock:
+                first = len(mock.timings)
+            elapsed, result = run_flow(workdir, mock.base_url, code)
+            after = mock.stats()
+            with mock.lock:
+                timings = sorted(mock.timings[first:])
+            rows.append({
+                'size': size,
+                'flow': name,
+                'seconds': elapsed,
+                'skus_per_second': size / elapsed,
+                'calls': after['requests'] - before['requests'],
+                'throttled': after['throttled'] - before['throttled'],
+                'mean_ms': 1000 * sum(timings) / len(timings) if timings else 0.0,
+                'p95_ms': 1000 * timings[math.ceil(0.95 * len(timings)) - 1] if timings else 0.0,
+                'ok': result.returncode == 0
+            })
+            if result.returncode != 0:
+                print(f"❌ {name} ({size} SKUs) exited with {result.returncode}:")
+                print('\n'.join((result.stdout + result.stderr).strip().splitlines()[-10:]))
+    finally:
+        server.shutdown()
+        server.server_close()
+        if options['keep']:
+            print(f"ℹ️  Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+def print_rows(rows):
+    print(f"{'SKUs':>6} {'Flow':<24} {'Seconds':>8} {'SKU/s':>8} {'Calls':>7} {'429s':>5} {'Mean ms':>8} {'p95 ms':>8}")
+    for row in rows:
+        print(f"{row['size']:>6} {row['flow']:<24} {row['seconds']:>8.2f} {row['skus_per_second']:>8.1f} "
+              f"{row['calls']:>7} {row['throttled']:>5} {row['mean_ms']:>8.1f} {row['p95_ms']:>8.1f}"
+              + ('' if row['ok'] else '  ❌'))
+
+def parse_options(args):
+    options = {'sizes': [10, 100, 1000], 'latency': 0.05, 'throttle': 0.0, 'rate_limit': None, 'photos': 3, 'keep': False, 'csv': None}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == '--keep':
+            options['keep'] = True
+        elif arg == '--csv' and args:
+            options['csv'] = args.pop(0)
+        elif arg == '--sizes' and args and all(part.isdigit() and int(part) > 0 for part in args[0].split(',')):
+            options['sizes'] = [int(part) for part in args.pop(0).split(',')]
+        elif arg in ('--rate-limit', '--photos') and args and args[0].isdigit() and int(args[0]) > 0:
+            options[arg[2:].replace('-', '_')] = int(args.pop(0))
+        elif arg in ('--latency', '--throttle') and args:
+            try:
+                options[arg[2:]] = float(args.pop(0))
+            except ValueError:
+                return None
+        else:
+            return None
+    return options
+
+def main():
+    options = parse_options(sys.argv[1:])
+    if options is None:
+        print(f"Usage: python {os.path.basename(__file__)} [--sizes 10,100,1000] [--latency 0.05] [--throttle 0.0] [--rate-limit N] [--photos 3] [--csv results.csv] [--keep]")
+        sys.exit(1)
+
+    print(f"latency {options['latency']}s, throttle {options['throttle']:.0%}, rate limit {options['rate_limit'] or 'none'}, {options['photos']} photo(s) per SKU\n")
+    rows = []
+    for size in options['sizes']:
+        rows.extend(run_size(size, options))
+    print_rows(rows)
+    if options['csv']:
+        pd.DataFrame(rows).to_csv(options['csv'], index=False)
+        print(f"\n✅ Results written to {options['csv']}")
+    if not all(row['ok'] for row in rows):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
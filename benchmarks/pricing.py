@@ -0,0 +1,62 @@
+import importlib.util
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Compares the rules-driven row-wise scorer (score_nascar_diecast, applied per
+# row) with the vectorized score_nascar_diecast_frame on a synthetic sheet and
+# checks both produce identical output with the default rules file.
+#   python3 benchmarks/pricing.py [rows]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # diecast.pricing.py imports sibling modules
+
+def load_pricing():
+    spec = importlib.util.spec_from_file_location('diecast_pricing', os.path.join(ROOT, 'diecast.pricing.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def synthetic_sheet(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    pick = lambda values: [values[i] for i in rng.integers(0, len(values), rows)]
+    drivers = [
+        'Dale Earnhardt', 'Dale Earnhardt Jr.', 'Jeff Gordon', 'Kyle Busch', 'Marcos Ambrose',
+        'Jeff Gordon / Dale Earnhardt', 'Unknown Driver', ' TONY STEWART ', np.nan
+    ]
+    editions = ['Elite', 'Limited Edition', 'Preview', 'Platinum Series', 'Galaxy', 'Standard', 'elite galaxy', np.nan]
+    max_values = [250, 499, 500, 999.0, 1000, 4999, 5000, 9999, 10000, 25000, '750', 'n/a', np.nan]
+    return pd.DataFrame({
+        'id': [str(i).zfill(6) for i in range(rows)],
+        'driver': pick(drivers),
+        'edition': pick(editions),
+        'max': pick(max_values),
+        'autographed': pick([True, False, 'TRUE', 'false', np.nan]),
+        'special': pick(['Color Chrome', np.nan, np.nan]),
+        'issue': pick(['Scuffed box', np.nan, np.nan, np.nan])
+    })
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pricing = load_pricing()
+    df = synthetic_sheet(rows)
+
+    rules = pricing.load_rules()
+    rowwise, rowwise_time = timed(lambda: df.apply(lambda row: pricing.score_nascar_diecast(row, rules), axis=1))
+    vectorized, vectorized_time = timed(lambda: pricing.score_nascar_diecast_frame(df, rules))
+
+    pd.testing.assert_frame_equal(rowwise.astype(vectorized.dtypes.to_dict()), vectorized)
+    print(f"rows:        {rows:,}")
+    print(f"row-wise:    {rowwise_time:8.3f}s")
+    print(f"vectorized:  {vectorized_time:8.3f}s")
+    print(f"speedup:     {rowwise_time / vectorized_time:8.1f}x (outputs identical)")
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
-import pandas as pd
 import sys
 import os
-import re
+from listing_template import compile_template
+from product_ids import parse_product_ids
+from sheet_cache import read_sheet
+from sheet_stream import iter_chunks
 
 def load_template(template_path):
     with open(template_path, 'r', encoding='utf-8') as file:
@@ -14,47 +16,77 @@ def save_output(content, output_prefix, row_id):
     print(f"✅ Generated: {filename}")
 
 def replace_tokens(template, row):
-    output = template
-    for col in row.index:
-        token = r"\{\{\s*" + re.escape(col) + r"\s*\}\}"
+    return compile_template(template).render_row(row)
 
-        value = ''
-        if pd.notna(row[col]):
-            val = row[col]
-            if isinstance(val, float) and val.is_integer():
-                value = str(int(val))
-            else:
-                value = str(val)
+def render_rows(template, df, output_prefix):
+    compiled = compile_template(template)
+    for row_id, content in zip(df['id'], compiled.render_frame(df)):
+        save_output(content, output_prefix, row_id)
 
-        output = re.sub(token, value, output)
-    return output
+def render_streaming(spreadsheet_file, template, id_spec, output_prefix):
+    # Renders chunk by chunk; a specific id selection stops reading once every
+    # requested row has been seen
+    wanted = None
+    if id_spec.strip().lower() != 'all':
+        wanted = {product_id.zfill(3) for product_id in parse_product_ids(id_spec)}
+    found = set()
+    for chunk in iter_chunks(spreadsheet_file):
+        chunk['id'] = chunk['id'].astype(str).str.zfill(3)
+        rows = chunk if wanted is None else chunk[chunk['id'].isin(wanted)]
+        render_rows(template, rows, output_prefix)
+        found.update(rows['id'])
+        if wanted is not None and found >= wanted:
+            break
+    for product_id in sorted((wanted or set()) - found):
+        print(f"❌ Product ID {product_id} not found in spreadsheet.")
+    if not found:
+        sys.exit(1)
 
 def main():
-    if len(sys.argv) != 4:
+    args = [arg for arg in sys.argv[1:] if arg != '--stream']
+    stream = len(args) != len(sys.argv) - 1
+    if len(args) != 3:
         script_name = os.path.basename(__file__)
-        print(f"Usage: python {script_name} <spreadsheet.xlsx> <template.html> <product-id>")
+        print(f"Usage: python {script_name} <spreadsheet.xlsx> <template.html> <product-id|first-last|all|@ids.txt> [--stream]")
         sys.exit(1)
 
-    spreadsheet_file = sys.argv[1]
-    template_file = sys.argv[2]
-    product_id = sys.argv[3].zfill(3)
+    spreadsheet_file, template_file, id_spec = args
     output_prefix = "diecast.listing."
 
+    if stream:
+        try:
+            template = load_template(template_file)
+            render_streaming(spreadsheet_file, template, id_spec, output_prefix)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Error reading input files: {e}")
+            sys.exit(1)
+        return
+
     try:
-        df = pd.read_excel(spreadsheet_file)
+        df = read_sheet(spreadsheet_file)
         df['id'] = df['id'].astype(str).str.zfill(3)
         template = load_template(template_file)
     except Exception as e:
         print(f"❌ Error reading input files: {e}")
         sys.exit(1)
 
-    row = df[df['id'] == product_id]
-    if row.empty:
+    try:
+        product_ids = [product_id.zfill(3) for product_id in parse_product_ids(id_spec, available=df['id'])]
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    rows = df[df['id'].isin(product_ids)]
+    missing = sorted(set(product_ids) - set(rows['id']))
+    for product_id in missing:
         print(f"❌ Product ID {product_id} not found in spreadsheet.")
+    if rows.empty:
         sys.exit(1)
 
-    content = replace_tokens(template, row.iloc[0])
-    save_output(content, output_prefix, product_id)
+    render_rows(template, rows, output_prefix)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,166 +1,342 @@
-
+import bisect
+import json
+import re
+import numpy as np
 import pandas as pd
 import sys
 import os
+from functools import lru_cache
+from local_cache import file_sha256, save_json
+from sheet_cache import read_sheet
+from sheet_stream import iter_chunks
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "diecast.pricing.rules.json")
+INT64_LIMIT = 2 ** 62
+SCORE_COLUMNS = ["w.rarity", "w.build", "w.autograph", "w.relevance", "w.special",
+                 "w.authenticity", "w.packaging", "reduce", "score", "price"]
+
+class KeywordMatcher:
+    # Scores text by the first listed keyword it contains (list order is the
+    # priority). A single precompiled pattern with an overlapping lookahead
+    # reports, at each position, the highest-priority keyword starting there,
+    # so the lowest index seen is the first listed keyword in the text.
+    def __init__(self, entries, default=0.0):
+        self.default = default
+        self.scores = []
+        self.priority = {}
+        for name, score in entries:
+            name = str(name).strip().lower()
+            if name and name not in self.priority:
+                self.priority[name] = len(self.scores)
+                self.scores.append(float(score))
+        alternation = '|'.join(re.escape(name) for name in self.priority)
+        self.pattern = re.compile(f"(?=({alternation}))") if alternation else None
+
+    def __call__(self, text):
+        if self.pattern is None:
+            return self.default
+        best = None
+        for match in self.pattern.finditer(text):
+            index = self.priority[match.group(1)]
+            if best is None or index < best:
+                best = index
+        return self.default if best is None else self.scores[best]
+
+class PricingRules:
+    def __init__(self, raw):
+        self.weights = [(name, float(weight)) for name, weight in raw["weights"].items()]
+        self.fixed_scores = {name: float(value) for name, value in raw.get("fixed_scores", {}).items()}
+        self.issue_multiplier = float(raw.get("issue_multiplier", 1.0))
+        self.rarity_breaks, self.rarity_scores = ladder(raw["rarity"], "max_below", "scores")
+        self.price_breaks, self.prices = ladder(raw["price"], "score_above", "prices")
+        self.edition = KeywordMatcher(raw["editions"]["keywords"], float(raw["editions"].get("default", 0.0)))
+        self.driver = KeywordMatcher(raw["drivers"]["names"], float(raw["drivers"].get("default", 0.0)))
+
+    # Scalar lookups (row-wise path)
+    def rarity(self, max_qty):
+        return self.rarity_scores[bisect.bisect_right(self.rarity_breaks, max_qty)]
 
-def score_nascar_diecast(row):
-    product_id = str(row.get("id", "")).strip().lower()
-    description = str(row.get("description", "")).strip()
-    edition = str(row.get("edition", "")).strip().lower()
+    def price(self, score):
+        return self.prices[bisect.bisect_left(self.price_breaks, score)]
+
+def ladder(section, breaks_key, values_key):
+    breaks = [float(b) for b in section[breaks_key]]
+    values = [float(v) for v in section[values_key]]
+    if breaks != sorted(breaks):
+        raise ValueError(f"Pricing rules: '{breaks_key}' must be in ascending order.")
+    if len(values) != len(breaks) + 1:
+        raise ValueError(f"Pricing rules: '{values_key}' needs one more entry than '{breaks_key}'.")
+    return breaks, values
+
+@lru_cache(maxsize=None)
+def load_rules(path=DEFAULT_RULES_PATH):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # optional: only needed for YAML rules files
+            raw = yaml.safe_load(f)
+        else:
+            raw = json.load(f)
+    return PricingRules(raw)
+
+def normalize_text(value):
+    return str(value).strip().lower()
+
+def parse_max_qty(value):
     try:
-        max_qty = int(float(row.get("max", 0)))
+        qty = int(float(value))
     except:
-        max_qty = sys.maxsize
-    driver = str(row.get("driver", "")).strip().lower()
+        qty = sys.maxsize
+    return min(max(qty, -INT64_LIMIT), INT64_LIMIT)
+
+def weighted_score(rules, components):
+    score = 0.0
+    for name, weight in rules.weights:
+        score = score + components[name] * weight
+    return score
+
+def score_nascar_diecast(row, rules=None):
+    rules = rules or load_rules()
+    max_qty = parse_max_qty(row.get("max", 0))
     special = not pd.isna(row.get("special"))
-    autograph_flag = str(row.get("autographed", "false")).strip().lower() == "true"
     issue = not pd.isna(row.get("issue"))
 
-    if max_qty < 500:
-        rarity = 1.0
-    elif max_qty < 1000:
-        rarity = 0.8
-    elif max_qty < 5000:
-        rarity = 0.6
-    elif max_qty < 10000:
-        rarity = 0.3
-    else:
-        rarity = 0.0
-
-    if "elite" in edition:
-        build = 1.0
-    elif "limited" in edition:
-        build = 0.3
-    elif "preview" in edition:
-        build = 0.3
-    elif "platinum" in edition:
-        build = 0.3
-    elif "preferred" in edition:
-        build = 0.3
-    elif "galaxy" in edition:
-        build = 0.3
-    else:
-        build = 0.0
-
-    autograph = 1.0 if autograph_flag else 0.0
-
-    driver_scores = {
-        "dale earnhardt": 1.00,
-        "jeff gordon": 1.00,
-        "jimmie johnson": 1.00,
-        "richard petty": 1.00,
-        "bobby allison": 0.95,
-        "david pearson": 0.95,
-        "dale earnhardt jr.": 0.95,
-        "aj foyt": 0.95,
-        "mark martin": 0.90,
-        "tony stewart": 0.90,
-        "junior johnson": 0.90,
-        "bill elliott": 0.85,
-        "brad keselowski": 0.85,
-        "joey logano": 0.85,
-        "kyle busch": 0.85,
-        "darrell waltrip": 0.80,
-        "terry labonte": 0.80,
-        "ernie irvan": 0.75,
-        "kasey kahne": 0.75,
-        "ricky rudd": 0.75,
-        "alex bowman": 0.70,
-        "william byron": 0.70,
-        "austin dillon": 0.65,
-        "daniel suarez": 0.65,
-        "juan pablo montoya": 0.65,
-        "jeb burton": 0.60,
-        "casey mears": 0.60,
-        "kenny irwin": 0.60,
-        "trevor bayne": 0.60,
-        "ward burton": 0.60,
-        "brian vickers": 0.55,
-        "marcos ambrose": 0.55
-    }
-
-    driver_key = driver.lower()
-    driver_relevance = 0.0  # default score
-    for name, score in driver_scores.items():
-        if name in driver_key:
-            driver_relevance = score
-            break
-
-    special_features = 1.0 if special else 0.0
-    authenticity = 1.0
-    packaging = 1.0
-
-    score = (
-        rarity * 0.30 +
-        build * 0.20 +
-        autograph * 0.15 +
-        special_features * 0.10 +
-        authenticity * 0.10 +
-        driver_relevance * 0.10 +
-        packaging * 0.05
-    )
-
-    if issue: score = score * 0.85
-
-    if score > 0.95:
-        price = 199.99
-    elif score > 0.90:
-        price = 179.99
-    elif score > 0.85:
-        price = 159.99
-    elif score > 0.80:
-        price = 139.99
-    elif score > 0.75:
-        price = 119.99
-    elif score > 0.70:
-        price = 99.99
-    elif score > 0.65:
-        price = 89.99
-    elif score > 0.60:
-        price = 74.99
-    elif score > 0.55:
-        price = 64.99
-    elif score > 0.50:
-        price = 54.99
-    elif score > 0.45:
-        price = 49.99
-    elif score > 0.40:
-        price = 44.99
-    elif score > 0.35:
-        price = 39.99
-    elif score > 0.30:
-        price = 34.99
-    elif score > 0.25:
-        price = 29.99
-    else:
-        price = 24.99
+    components = dict(rules.fixed_scores)
+    components.update({
+        "rarity": rules.rarity(max_qty),
+        "build": rules.edition(normalize_text(row.get("edition", ""))),
+        "autograph": 1.0 if normalize_text(row.get("autographed", "false")) == "true" else 0.0,
+        "relevance": rules.driver(normalize_text(row.get("driver", ""))),
+        "special": 1.0 if special else 0.0
+    })
+
+    score = weighted_score(rules, components)
+    if issue: score = score * rules.issue_multiplier
 
     return pd.Series({
-        "w.rarity": rarity,
-        "w.build": build,
-        "w.autograph": autograph,
-        "w.relevance": driver_relevance,
-        "w.special": special_features,
-        "w.authenticity": authenticity,
-        "w.packaging": packaging,
+        "w.rarity": components["rarity"],
+        "w.build": components["build"],
+        "w.autograph": components["autograph"],
+        "w.relevance": components["relevance"],
+        "w.special": components["special"],
+        "w.authenticity": components.get("authenticity", 0.0),
+        "w.packaging": components.get("packaging", 0.0),
         "reduce": issue,
         "score": round(score, 2),
-        "price": price
+        "price": rules.price(score)
+    })
+
+def map_unique(series, func):
+    # Spreadsheet columns repeat a handful of values; evaluate func once per
+    # distinct value and broadcast the results back over the rows.
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return np.array([func(value) for value in uniques])[codes]
+
+def column(df, name, default):
+    return df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
+
+def score_nascar_diecast_frame(df, rules=None):
+    rules = rules or load_rules()
+    if df.empty:
+        return pd.DataFrame(index=df.index, columns=SCORE_COLUMNS)
+
+    max_qty = map_unique(column(df, "max", 0), parse_max_qty)
+    issue = ~column(df, "issue", None).isna().to_numpy()
+
+    components = {name: np.full(len(df), value) for name, value in rules.fixed_scores.items()}
+    components.update({
+        "rarity": np.array(rules.rarity_scores)[np.searchsorted(rules.rarity_breaks, max_qty, side="right")],
+        "build": map_unique(column(df, "edition", ""), lambda value: rules.edition(normalize_text(value))),
+        "autograph": map_unique(column(df, "autographed", "false"), lambda value: 1.0 if normalize_text(value) == "true" else 0.0),
+        "relevance": map_unique(column(df, "driver", ""), lambda value: rules.driver(normalize_text(value))),
+        "special": np.where(column(df, "special", None).isna().to_numpy(), 0.0, 1.0)
     })
 
+    score = weighted_score(rules, components)
+    score = np.where(issue, score * rules.issue_multiplier, score)
+    price = np.array(rules.prices)[np.searchsorted(rules.price_breaks, score, side="left")]
+    zeros = np.zeros(len(df))
+
+    return pd.DataFrame({
+        "w.rarity": components["rarity"],
+        "w.build": components["build"],
+        "w.autograph": components["autograph"],
+        "w.relevance": components["relevance"],
+        "w.special": components["special"],
+        "w.authenticity": components.get("authenticity", zeros),
+        "w.packaging": components.get("packaging", zeros),
+        "reduce": issue,
+        # Python's round() rather than np.round so 2-decimal ties match exactly
+        "score": [round(value, 2) for value in score.tolist()],
+        "price": price
+    }, index=df.index)
+
+# Incremental re-pricing: a fingerprint file next to the output records a hash
+# of every row's inputs plus the rules file, so later runs only score rows
+# whose inputs changed and can report which prices moved.
+def fingerprint_path(output_spreadsheet):
+    return f"{output_spreadsheet}.fingerprints.json"
+
+def normalize_cell(value):
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def row_hashes(df):
+    normalized = df.map(normalize_cell)
+    normalized = normalized[sorted(normalized.columns)]
+    return pd.util.hash_pandas_object(normalized, index=False).astype(str)
+
+def load_fingerprints(output_spreadsheet, rules_hash):
+    try:
+        with open(fingerprint_path(output_spreadsheet), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("rules") != rules_hash or not os.path.exists(output_spreadsheet):
+        return {}
+    return data.get("rows", {})
+
+def save_fingerprints(output_spreadsheet, rules_hash, ids, hashes, prices):
+    rows = {str(i): {"hash": h, "price": float(p)} for i, h, p in zip(ids, hashes, prices)}
+    save_json(fingerprint_path(output_spreadsheet), {"rules": rules_hash, "rows": rows})
+
+def price_incrementally(df, output_spreadsheet, rules, rules_hash):
+    hashes = row_hashes(df)
+    previous = load_fingerprints(output_spreadsheet, rules_hash)
+    ids = df["id"].astype(str)
+    if ids.duplicated().any():
+        previous = {}
+    changed = pd.Series([previous.get(i, {}).get("hash") != h for i, h in zip(ids, hashes)], index=df.index)
+
+    scores = pd.DataFrame(index=df.index, columns=SCORE_COLUMNS)
+    if (~changed).any():
+        previous_scores = read_sheet(output_spreadsheet, dtype={"id": str}).set_index("id")
+        unchanged_ids = ids[~changed]
+        missing = ~unchanged_ids.isin(previous_scores.index)
+        changed[unchanged_ids[missing].index] = True
+        unchanged_ids = unchanged_ids[~missing]
+        scores.loc[unchanged_ids.index] = previous_scores.loc[unchanged_ids.values, SCORE_COLUMNS].to_numpy()
+    if changed.any():
+        scores.loc[changed] = score_nascar_diecast_frame(df[changed], rules)
+    scores = scores.infer_objects()
+
+    moves = []
+    current_ids = set(ids)
+    for product_id, old in previous.items():
+        if product_id not in current_ids:
+            moves.append((product_id, old["price"], None))
+    for product_id, price in zip(ids[changed], scores.loc[changed, "price"]):
+        old_price = previous.get(product_id, {}).get("price")
+        if old_price != float(price):
+            moves.append((product_id, old_price, float(price)))
+
+    return scores, hashes, int(changed.sum()), moves
+
+def report_moves(moves, changed_count, total, changed_ids_path=None):
+    print(f"♻️  Scored {changed_count} of {total} row(s); {total - changed_count} unchanged")
+    for product_id, old_price, new_price in moves:
+        if old_price is None:
+            print(f"  🆕 {product_id}: {new_price}")
+        elif new_price is None:
+            print(f"  🗑️  {product_id}: removed (was {old_price})")
+        else:
+            print(f"  💲 {product_id}: {old_price} → {new_price}")
+    moved_ids = [product_id for product_id, _, new_price in moves if new_price is not None]
+    if changed_ids_path:
+        with open(changed_ids_path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{product_id}\n" for product_id in moved_ids))
+        print(f"Changed product ids saved to: {changed_ids_path}")
+    elif moved_ids:
+        print(f"Changed product ids: {','.join(moved_ids)}")
+
+# Streaming mode: score the workbook chunk by chunk and append each chunk to a
+# write-only output workbook, so neither sheet is ever held in memory whole.
+def excel_value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+def price_streaming(input_spreadsheet, output_spreadsheet, rules, rules_hash):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    ids, hashes, prices = [], [], []
+    for number, chunk in enumerate(iter_chunks(input_spreadsheet, dtype={"id": str})):
+        scored = chunk.join(score_nascar_diecast_frame(chunk, rules))
+        if number == 0:
+            sheet.append(list(scored.columns))
+        for row in scored.itertuples(index=False):
+            sheet.append([excel_value(value) for value in row])
+        ids.extend(chunk["id"])
+        hashes.extend(row_hashes(chunk))
+        prices.extend(scored["price"])
+    workbook.save(output_spreadsheet)
+    save_fingerprints(output_spreadsheet, rules_hash, ids, hashes, prices)
+    return len(ids)
+
+def parse_options(args):
+    options = {"rules_path": DEFAULT_RULES_PATH, "incremental": False, "stream": False, "changed_ids_path": None}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--rules" and args:
+            options["rules_path"] = args.pop(0)
+        elif arg == "--incremental":
+            options["incremental"] = True
+        elif arg == "--stream":
+            options["stream"] = True
+        elif arg == "--changed-ids" and args:
+            options["changed_ids_path"] = args.pop(0)
+        else:
+            return None
+    return options
+
 def main():
-    if len(sys.argv) != 3:
+    options = parse_options(sys.argv[3:])
+    # --changed-ids is written from the incremental diff, which --stream and full runs never compute
+    if len(sys.argv) < 3 or options is None or (options["stream"] and options["incremental"]) \
+            or (options["changed_ids_path"] and not options["incremental"]):
         script_name = os.path.basename(__file__)
-        print(f"Usage: python {script_name} <input.xlsx> <output.xlsx>")
+        print(f"Usage: python {script_name} <input.xlsx> <output.xlsx> [--rules rules.json] [--incremental [--changed-ids ids.txt]]")
+        print(f"       python {script_name} <input.xlsx> <output.xlsx> [--rules rules.json] --stream")
         sys.exit(1)
 
     input_spreadsheet = sys.argv[1]
     output_spreadsheet = sys.argv[2]
+    rules_path = options["rules_path"]
 
-    df = pd.read_excel(input_spreadsheet, dtype={"id": str})
-    scored_df = df.join(df.apply(score_nascar_diecast, axis=1))
-    # scored_df = df.apply(score_nascar_diecast, axis=1)
+    try:
+        rules = load_rules(rules_path)
+        rules_hash = file_sha256(rules_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Error loading pricing rules {rules_path}: {e}")
+        sys.exit(1)
+
+    price_workbook(input_spreadsheet, output_spreadsheet, rules, rules_hash, options["incremental"],
+                   options["changed_ids_path"], options["stream"])
+
+def price_workbook(input_spreadsheet, output_spreadsheet, rules, rules_hash, incremental=False,
+                   changed_ids_path=None, stream=False):
+    if stream:
+        count = price_streaming(input_spreadsheet, output_spreadsheet, rules, rules_hash)
+        print(f"Pricing data for {count} row(s) saved to: {output_spreadsheet}")
+        return
+
+    df = read_sheet(input_spreadsheet, dtype={"id": str})
+    if incremental:
+        scores, hashes, changed_count, moves = price_incrementally(df, output_spreadsheet, rules, rules_hash)
+        report_moves(moves, changed_count, len(df), changed_ids_path)
+        if changed_count == 0 and not moves:
+            print(f"Pricing data unchanged: {output_spreadsheet}")
+            return
+    else:
+        scores = score_nascar_diecast_frame(df, rules)
+        hashes = row_hashes(df)
+    scored_df = df.join(scores)
     scored_df.to_excel(output_spreadsheet, index=False)
+    save_fingerprints(output_spreadsheet, rules_hash, df["id"], hashes, scores["price"])
     print(f"Pricing data saved to: {output_spreadsheet}")
 
 if __name__ == "__main__":
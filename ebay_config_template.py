@@ -46,10 +46,11 @@ RUNAME = CONFIG[ENV]['RUNAME']
 # Export selected confidential
 SHIPPING_ADDRESS = CONFIDENTIAL['address']
 
-import requests
+import ebay_rest
 import base64
+from token_cache import get_cached_token
 
-def get_oauth_token_from_refresh_token(scopes):
+def request_oauth_token(scopes):
     url = 'https://api.sandbox.ebay.com/identity/v1/oauth2/token' if ENV == 'sandbox' else 'https://api.ebay.com/identity/v1/oauth2/token'
     
     credentials = f"{APP_ID}:{CERT_ID}"
@@ -68,9 +69,14 @@ def get_oauth_token_from_refresh_token(scopes):
         'scope': scope_string,
     }
 
-    response = requests.post(url, headers=headers, data=data)
+    response = ebay_rest.post(url, headers=headers, data=data)
     
     if response.status_code == 200:
-        return response.json()['access_token']
+        return response.json()
     else:
-        raise Exception(f"Token refresh failed: {response.status_code}\n{response.text}")
\ No newline at end of file
+        raise Exception(f"Token refresh failed: {response.status_code}\n{response.text}")
+
+# Access tokens last two hours; reuse them across processes via .cache/
+def get_oauth_token_from_refresh_token(scopes):
+    account = f"{APP_ID}:{CONFIG[ENV]['REFRESH_TOKEN']}"
+    return get_cached_token(ENV, scopes, lambda: request_oauth_token(scopes), account=account)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP layer for the eBay REST calls: one keep-alive connection pool per
+# process, a default timeout on every call, and retries with exponential
+# backoff + jitter on throttling (429) and transient server errors.
+
+DEFAULT_TIMEOUT = (10, 60)  # (connect, read) seconds
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+POOL_SIZE = 32
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A POST that failed with a 5xx may already have been applied; only retry it
+# when eBay says the request was not processed.
+RETRY_STATUSES_NON_IDEMPOTENT = {429, 503}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}
+
+# Sends every REST call, the OAuth token refresh included, to another host such
+# as the offline stand-in from mock_ebay.py: EBAY_API_BASE_URL=http://127.0.0.1:8765
+API_BASE_URL = os.environ.get('EBAY_API_BASE_URL', '').rstrip('/')
+EBAY_HOSTS = ('https://api.ebay.com', 'https://api.sandbox.ebay.com')
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+def header_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def server_delay(response):
+    # Retry-After (seconds or HTTP date), or the rate-limit reset eBay sends
+    # with throttled responses.
+    headers = response.headers
+    delay = header_seconds(headers.get('Retry-After'))
+    if delay is None and headers.get('X-RateLimit-Remaining') == '0':
+        delay = header_seconds(headers.get('X-RateLimit-Reset'))
+    return None if delay is None else min(delay, BACKOFF_CAP * 4)
+
+def backoff_delay(attempt):
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+def should_retry(method, status_code):
+    statuses = RETRY_STATUSES if method in IDEMPOTENT_METHODS else RETRY_STATUSES_NON_IDEMPOTENT
+    return status_code in statuses
+
+def api_url(url):
+    if API_BASE_URL:
+        for host in EBAY_HOSTS:
+            if url.startswith(host + '/'):
+                return API_BASE_URL + url[len(host):]
+    return url
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, **kwargs):
+    method = method.upper()
+    url = api_url(url)
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == retries or method not in IDEMPOTENT_METHODS:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if attempt == retries or not should_retry(method, response.status_code):
+            return response
+        delay = server_delay(response)
+        time.sleep(delay if delay is not None else backoff_delay(attempt))
+    return response
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+def put(url, **kwargs):
+    return request('PUT', url, **kwargs)
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
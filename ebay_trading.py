@@ -0,0 +1,46 @@
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from ebaysdk.trading import Connection as Trading
+from ebay_config import ENV, DEV_ID, APP_ID, CERT_ID, USER_TOKEN, EBAY_SITE_ID, EBAY_API_DOMAIN
+from ebay_rest import API_BASE_URL
+
+# One Trading API connection per environment and thread, reused for every call.
+# ebaysdk connections keep per-request state, so threads cannot share one.
+_thread_state = threading.local()
+
+class KeepAliveSession(requests.Session):
+    # ebaysdk closes its session after every response, which drops the pooled
+    # connection; keep it open for the life of the cached client instead.
+    def close(self):
+        pass
+
+def create_trading_api():
+    target = urlparse(API_BASE_URL) if API_BASE_URL else None
+    api = Trading(
+        domain=target.netloc if target else EBAY_API_DOMAIN,
+        config_file=None,
+        appid=APP_ID,
+        certid=CERT_ID,
+        devid=DEV_ID,
+        token=USER_TOKEN,
+        siteid=EBAY_SITE_ID,
+        warnings=True
+    )
+    session = KeepAliveSession()
+    session.mount('http://', HTTPAdapter(max_retries=3))
+    session.mount('https://', HTTPAdapter(max_retries=3))
+    api.session = session
+    if target:
+        # ebaysdk forces https in its constructor; a local stand-in may be plain http
+        api.config.set('https', target.scheme == 'https', force=True)
+    return api
+
+def get_trading_api():
+    apis = getattr(_thread_state, 'apis', None)
+    if apis is None:
+        apis = _thread_state.apis = {}
+    if ENV not in apis:
+        apis[ENV] = create_trading_api()
+    return apis[ENV]
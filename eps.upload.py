@@ -1,10 +1,14 @@
 import os
 import sys
 import csv
-from urllib.parse import urlparse
-from ebaysdk.trading import Connection as Trading
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from ebaysdk.exception import ConnectionError
-from ebay_config import ENV, DEV_ID, APP_ID, CERT_ID, USER_TOKEN, EBAY_SITE_ID, EBAY_API_DOMAIN
+from ebay_config import ENV
+from ebay_trading import get_trading_api
+from eps_cache import EpsCache, content_hash, eps_csv_name
+
+DEFAULT_WORKERS = 4
 
 def upload_image_with_ebaysdk(image_url, api):
     try:
@@ -14,7 +18,8 @@ def upload_image_with_ebaysdk(image_url, api):
             'PhotoDisplay': 'SuperSize'
         })
         if response.reply.Ack == "Success":
-            return response.reply.SiteHostedPictureDetails.FullURL, "Success"
+            details = response.reply.SiteHostedPictureDetails
+            return details.FullURL, "Success", getattr(details, 'UseByDate', None)
         else:
             if hasattr(response.reply, 'Errors'):
                 errors = response.reply.Errors
@@ -25,22 +30,101 @@ def upload_image_with_ebaysdk(image_url, api):
                 )
             else:
                 error_message = "Unknown error with no Errors field"
-            return None, f"API Error: {error_message}"
+            return None, f"API Error: {error_message}", None
     except ConnectionError as e:
-        return None, f"Connection error: {e}"
+        return None, f"Connection error: {e}", None
+    except Exception as e:
+        return None, f"Unexpected error: {str(e)}", None
+
+def upload_in_worker(image_url):
+    try:
+        api = get_trading_api()
     except Exception as e:
-        return None, f"Unexpected error: {str(e)}"
+        return None, f"Failed to initialize eBay SDK: {str(e)}", None
+    return upload_image_with_ebaysdk(image_url, api)
+
+def upload_images(urls, workers=DEFAULT_WORKERS):
+    # Results come back in input order: the first photo becomes the gallery image
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(upload_in_worker, urls))
+
+def image_content_hash(image_url):
+    # EPS copies the photo from S3, so the cache is keyed on the S3 object (its
+    # ETag) rather than a local file that may not have been synced yet
+    try:
+        r = requests.head(image_url, timeout=60)
+        etag = r.headers.get('ETag', '').strip('"') if r.status_code == 200 else ''
+        if etag:
+            return f"etag:{etag}"
+        r = requests.get(image_url, timeout=60)
+        if r.status_code == 200:
+            return content_hash(r.content)
+    except requests.exceptions.RequestException:
+        pass
+    return None
+
+def hash_images(urls, workers=DEFAULT_WORKERS):
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(image_content_hash, urls))
+
+def upload_with_cache(urls, workers=DEFAULT_WORKERS, use_cache=True):
+    if not use_cache:
+        return [(ebay_url, status) for ebay_url, status, _ in upload_images(urls, workers)]
+
+    cache = EpsCache(ENV)
+    try:
+        hashes = hash_images(urls, workers)
+        results = [None] * len(urls)
+        pending = []
+        for i, digest in enumerate(hashes):
+            cached_url = cache.get(digest) if digest else None
+            if cached_url:
+                results[i] = (cached_url, "Cached")
+            else:
+                pending.append(i)
+
+        uploaded = upload_images([urls[i] for i in pending], workers)
+        for i, (ebay_url, status, use_by) in zip(pending, uploaded):
+            results[i] = (ebay_url, status)
+            if ebay_url and hashes[i]:
+                cache.put(hashes[i], urls[i], ebay_url, use_by)
+        return results
+    finally:
+        cache.close()
+
+def write_eps_csv(urls, output_file, workers=DEFAULT_WORKERS, use_cache=True):
+    rows = [(url, ebay_url, status) for url, (ebay_url, status) in zip(urls, upload_with_cache(urls, workers, use_cache))]
+    with open(output_file, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["S3_URL", "eBay_URL", "Status"])
+        for url, ebay_url, status in rows:
+            writer.writerow([url, ebay_url if ebay_url else "", status])
+    return rows
+
+def parse_options(args):
+    options = {'workers': DEFAULT_WORKERS, 'use_cache': True}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == '--workers' and args and args[0].isdigit() and int(args[0]) > 0:
+            options['workers'] = int(args.pop(0))
+        elif arg == '--no-cache':
+            options['use_cache'] = False
+        else:
+            return None
+    return options
 
 def main():
-    if len(sys.argv) != 4:
+    options = parse_options(sys.argv[4:])
+    if len(sys.argv) < 4 or options is None:
         script_name = os.path.basename(__file__)
-        print(f"Usage: python {script_name} <s3-urls-file.txt> <category> <product-id>")
+        print(f"Usage: python {script_name} <s3-urls-file.txt> <category> <product-id> [--workers N] [--no-cache]")
         sys.exit(1)
 
     file_path = sys.argv[1]
     category = sys.argv[2]
     product_id = sys.argv[3]
-    output_file = f"eps.{category}.{product_id}{f'.{ENV}' if ENV != 'production' else ''}.urls.csv"
+    output_file = eps_csv_name(category, product_id, ENV)
 
     if not os.path.exists(file_path):
         print(f"❌ File not found: {file_path}")
@@ -54,31 +138,18 @@ def main():
         sys.exit(0)
 
     try:
-        api = Trading(
-            domain=EBAY_API_DOMAIN,
-            config_file=None,
-            appid=APP_ID,
-            certid=CERT_ID,
-            devid=DEV_ID,
-            token=USER_TOKEN,
-            siteid=EBAY_SITE_ID,
-            warnings=True
-        )
+        get_trading_api()
     except Exception as e:
         print(f"❌ Failed to initialize eBay SDK: {str(e)}")
         sys.exit(1)
 
-    with open(output_file, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["S3_URL", "eBay_URL", "Status"])
-
-        for url in urls:
-            ebay_url, status = upload_image_with_ebaysdk(url, api)
-            writer.writerow([url, ebay_url if ebay_url else "", status])
-            if ebay_url:
-                print(f"✅ Uploaded: {url} → {ebay_url}")
-            else:
-                print(f"❌ Failed: {url} → {status}")
+    for url, ebay_url, status in write_eps_csv(urls, output_file, options['workers'], options['use_cache']):
+        if status == "Cached":
+            print(f"♻️  Cached: {url} → {ebay_url}")
+        elif ebay_url:
+            print(f"✅ Uploaded: {url} → {ebay_url}")
+        else:
+            print(f"❌ Failed: {url} → {status}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
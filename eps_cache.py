@@ -0,0 +1,66 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from local_cache import cache_path
+
+# eBay keeps unused EPS pictures for a limited time; UploadSiteHostedPictures
+# reports the exact UseByDate, this is only the fallback when it is missing.
+DEFAULT_LIFETIME = timedelta(days=30)
+EXPIRY_MARGIN = timedelta(days=1)
+
+def eps_csv_name(category, product_id, env):
+    # Written by eps.upload.py, read by stock.py; ids padded like the listing files (7 -> 007)
+    return f"eps.{category}.{str(product_id).zfill(3)}{f'.{env}' if env != 'production' else ''}.urls.csv"
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def parse_ebay_date(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class EpsCache:
+    def __init__(self, env, path=None):
+        self.env = env
+        self.conn = sqlite3.connect(path or cache_path('eps.sqlite'))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS eps_images (
+                env TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                source_url TEXT,
+                eps_url TEXT NOT NULL,
+                uploaded_at TEXT NOT NULL,
+                use_by TEXT NOT NULL,
+                PRIMARY KEY (env, content_hash)
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, content_hash):
+        row = self.conn.execute(
+            'SELECT eps_url, use_by FROM eps_images WHERE env = ? AND content_hash = ?',
+            (self.env, content_hash)
+        ).fetchone()
+        if not row:
+            return None
+        eps_url, use_by = row
+        if parse_ebay_date(use_by) <= datetime.now(timezone.utc) + EXPIRY_MARGIN:
+            return None
+        return eps_url
+
+    def put(self, content_hash, source_url, eps_url, use_by=None):
+        now = datetime.now(timezone.utc)
+        expires = parse_ebay_date(use_by) or now + DEFAULT_LIFETIME
+        self.conn.execute(
+            'INSERT OR REPLACE INTO eps_images VALUES (?, ?, ?, ?, ?, ?)',
+            (self.env, content_hash, source_url, eps_url, now.isoformat(), expires.isoformat())
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
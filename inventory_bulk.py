@@ -0,0 +1,25 @@
+import ebay_rest
+
+# Bulk Inventory API calls shared by stock.py (items, offers, publish) and
+# manage.py (prices). Every bulk call takes at most BULK_LIMIT requests and
+# answers 200/207 with one response entry per request.
+
+BULK_LIMIT = 25  # eBay's maximum number of requests per bulk Inventory API call
+
+def chunked(items, size=BULK_LIMIT):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def format_errors(entry):
+    errors = entry.get('errors') or []
+    return '; '.join(e.get('longMessage', e.get('message', 'Unknown error')) for e in errors) or 'Unknown error'
+
+def post_bulk(base_url, headers, endpoint, requests_payload):
+    # Returns (responses, None), or (None, error message) when the whole call failed
+    r = ebay_rest.post(f"{base_url}/sell/inventory/v1/{endpoint}", headers=headers, json={'requests': requests_payload})
+    if r.status_code not in {200, 207}:
+        return None, f"{endpoint} failed: {r.status_code} {r.text}"
+    try:
+        return r.json().get('responses', []), None
+    except ValueError:
+        return [], None
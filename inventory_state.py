@@ -0,0 +1,92 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from local_cache import cache_path
+
+# Last-pushed state per SKU, one database per environment: payload hashes let
+# stock.py skip writes that would not change anything, and the stored
+# offerId/listingId spare manage.py a GET /offer?sku= lookup. orders.sync.py
+# records sold SKUs (sold_at/order_id) and its lastModifiedDate watermark here.
+
+# Columns added after the first release; older databases are migrated on open
+ADDED_COLUMNS = {
+    'sold_at': 'TEXT',
+    'order_id': 'TEXT'
+}
+
+def payload_hash(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+class InventoryState:
+    def __init__(self, env, path=None):
+        self.conn = sqlite3.connect(path or cache_path(f"inventory.{env}.sqlite"), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS skus (
+                sku TEXT PRIMARY KEY,
+                item_hash TEXT,
+                offer_hash TEXT,
+                offer_id TEXT,
+                listing_id TEXT,
+                updated_at TEXT
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        existing = {row['name'] for row in self.conn.execute('PRAGMA table_info(skus)')}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE skus ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+
+    def get(self, sku):
+        with self.lock:
+            row = self.conn.execute('SELECT * FROM skus WHERE sku = ?', (sku,)).fetchone()
+        return dict(row) if row else None
+
+    def update(self, sku, **fields):
+        fields['updated_at'] = datetime.now(timezone.utc).isoformat()
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self.lock:
+            self.conn.execute('INSERT OR IGNORE INTO skus (sku) VALUES (?)', (sku,))
+            self.conn.execute(f"UPDATE skus SET {assignments} WHERE sku = ?", (*fields.values(), sku))
+            self.conn.commit()
+
+    def mark_sold(self, sku, order_id, sold_at):
+        self.update(sku, order_id=order_id, sold_at=sold_at)
+
+    def clear_sold(self, sku):
+        # Cancelled orders and restocked cars go back to the listing runs
+        with self.lock:
+            self.conn.execute('UPDATE skus SET sold_at = NULL, order_id = NULL WHERE sku = ?', (sku,))
+            self.conn.commit()
+
+    def sold_skus(self):
+        with self.lock:
+            rows = self.conn.execute('SELECT sku, sold_at FROM skus WHERE sold_at IS NOT NULL').fetchall()
+        return {row['sku']: row['sold_at'] for row in rows}
+
+    def get_sync_value(self, name):
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return row['value'] if row else None
+
+    def set_sync_value(self, name, value):
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)', (name, value))
+            self.conn.commit()
+
+    def forget(self, sku):
+        with self.lock:
+            self.conn.execute('DELETE FROM skus WHERE sku = ?', (sku,))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
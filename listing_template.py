@@ -0,0 +1,45 @@
+import re
+from functools import lru_cache
+import pandas as pd
+
+# Listing templates use {{column}} tokens (whitespace inside the braces is
+# allowed). A template is split once into literal text and token names, and
+# each row is rendered in a single pass by joining the pieces back together.
+TOKEN_PATTERN = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+
+def format_value(val):
+    if pd.isna(val):
+        return ''
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    return str(val)
+
+class CompiledTemplate:
+    def __init__(self, template):
+        pieces = TOKEN_PATTERN.split(template)
+        self.literals = pieces[0::2]
+        self.names = pieces[1::2]
+        # Unknown tokens are left exactly as written
+        self.raw_tokens = [match.group(0) for match in TOKEN_PATTERN.finditer(template)]
+
+    def render(self, values):
+        out = [self.literals[0]]
+        for name, raw, literal in zip(self.names, self.raw_tokens, self.literals[1:]):
+            out.append(values.get(name, raw))
+            out.append(literal)
+        return ''.join(out)
+
+    def render_row(self, row):
+        values = {str(col).strip(): format_value(row[col]) for col in row.index}
+        return self.render(values)
+
+    def render_frame(self, df):
+        # Only format the columns the template actually references
+        columns = {str(col).strip(): col for col in df.columns}
+        used = [name for name in dict.fromkeys(self.names) if name in columns]
+        for record in df[[columns[name] for name in used]].itertuples(index=False, name=None):
+            yield self.render({name: format_value(val) for name, val in zip(used, record)})
+
+@lru_cache(maxsize=32)
+def compile_template(template):
+    return CompiledTemplate(template)
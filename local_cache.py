@@ -0,0 +1,35 @@
+import hashlib
+import json
+import os
+
+# Local state (caches, manifests, sync watermarks) lives under one directory,
+# relative to where the commands are run, like the generated csv/html files.
+CACHE_DIR = os.environ.get('EBAY_AUTOMATION_CACHE_DIR', '.cache')
+
+def cache_path(*parts):
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_json(path):
+    # A missing or unreadable file reads as empty
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_json(path, data, mode=0o666, **options):
+    # Written to a temp file and swapped in, so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **options)
+    os.replace(tmp_path, path)
@@ -1,18 +1,33 @@
 import sys
 import os
+import csv
+import json
+import threading
 import requests
-from ebay_config import ENV, DEV_ID, APP_ID, CERT_ID, USER_TOKEN, EBAY_SITE_ID, EBAY_API_DOMAIN, get_oauth_token_from_refresh_token
-from ebaysdk.trading import Connection as Trading
+import ebay_rest
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from ebay_config import ENV
+from token_cache import auth_headers
+from ebay_trading import get_trading_api
 from ebaysdk.exception import ConnectionError
+from product_ids import parse_product_ids
+from inventory_state import InventoryState
+from inventory_bulk import chunked, format_errors, post_bulk
 
-# Get access token for REST API
-OAUTH_TOKEN = get_oauth_token_from_refresh_token([
+SCOPES = [
     'https://api.ebay.com/oauth/api_scope/sell.inventory'
-])
+]
 BASE_URL = 'https://api.sandbox.ebay.com' if ENV == 'sandbox' else 'https://api.ebay.com'
-HEADERS = {
-    'Authorization': f"Bearer {OAUTH_TOKEN}",
-    'Content-Type': 'application/json'
+SKU_PREFIX = 'DIECAST-'
+PAGE_SIZE = 200  # largest page eBay allows for inventory_item and GetMyeBaySelling
+DEFAULT_WORKERS = 8  # concurrent SKUs for bulk publish/end/delete
+
+# GetMyeBaySelling lists, in priority order, and the GetItem ListingStatus each maps to
+SELLING_LISTS = {
+    'ActiveList': 'Active',
+    'SoldList': 'Completed',
+    'UnsoldList': 'Ended'
 }
 
 def safe_json(r):
@@ -21,97 +36,117 @@ def safe_json(r):
     except ValueError:
         return {}
 
+@lru_cache(maxsize=None)
+def get_state():
+    return InventoryState(ENV)
+
+def lookup_offer(sku, need_listing=False, refresh=False):
+    # Returns (offer_id, listing_id). The local state store written by stock.py
+    # and earlier manage.py runs answers without a GET /offer?sku= round trip.
+    record = {} if refresh else (get_state().get(sku) or {})
+    if record.get('offer_id') and (record.get('listing_id') or not need_listing):
+        return record['offer_id'], record.get('listing_id')
+
+    r = ebay_rest.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=auth_headers(SCOPES))
+    if r.status_code != 200:
+        raise LookupError(f"Failed to fetch offer for SKU {sku}: {r.status_code}")
+    offers = safe_json(r).get('offers', [])
+    if not offers:
+        return None, None
+    offer_id = offers[0]['offerId']
+    listing_id = offers[0].get('listing', {}).get('listingId')
+    get_state().update(sku, offer_id=offer_id, listing_id=listing_id)
+    return offer_id, listing_id
+
+def error_message(r):
+    errors = safe_json(r).get('errors') or [{}]
+    return f"{r.status_code} {errors[0].get('message', '')}".strip()
+
+# Bulk actions run SKUs on worker threads; one lock keeps their lines whole
+PRINT_LOCK = threading.Lock()
+
+def say(*args):
+    with PRINT_LOCK:
+        print(*args)
+
+# publish/end/delete print their progress and return (ok, message) so that the
+# bulk form of each action can summarize many SKUs
 def publish_offer(sku):
     try:
-        url = f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}"
-        r = requests.get(url, headers=HEADERS)
-        if r.status_code != 200:
-            print(f"❌ Failed to fetch offer for SKU {sku}: {r.status_code}")
-            return
-        data = safe_json(r)
-        offers = data.get('offers', [])
-        if not offers:
-            print(f"⚠️  No offer found for SKU {sku}")
-            return
-        offer_id = offers[0]['offerId']
+        offer_id, _ = lookup_offer(sku)
+        if not offer_id:
+            say(f"⚠️  No offer found for SKU {sku}")
+            return False, 'no offer found'
         pub_url = f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}/publish"
-        r = requests.post(pub_url, headers=HEADERS)
-        print(f"✅ Publish Offer [{sku}]:", r.status_code)
-        print(safe_json(r) if r.content else "(no JSON body)")
+        r = ebay_rest.post(pub_url, headers=auth_headers(SCOPES))
+        if r.status_code == 404:
+            # Stored offer id is stale; look the offer up again
+            offer_id, _ = lookup_offer(sku, refresh=True)
+            if not offer_id:
+                say(f"⚠️  No offer found for SKU {sku}")
+                return False, 'no offer found'
+            r = ebay_rest.post(f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}/publish", headers=auth_headers(SCOPES))
+        say(f"✅ Publish Offer [{sku}]:", r.status_code)
+        say(safe_json(r) if r.content else "(no JSON body)")
+        listing_id = safe_json(r).get('listingId')
+        if listing_id:
+            get_state().update(sku, listing_id=listing_id)
+            return True, f"published as listing {listing_id}"
+        return False, f"publish failed: {error_message(r)}"
+    except LookupError as e:
+        say(f"❌ {e}")
+        return False, str(e)
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network error while publishing offer: {e}")
+        say(f"❌ Network error while publishing offer: {e}")
+        return False, f"network error: {e}"
 
 def end_listing(sku):
     try:
-        r = requests.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=HEADERS)
-        if r.status_code != 200:
-            print(f"❌ Failed to fetch offer for SKU {sku}: {r.status_code}")
-            return
-        data = safe_json(r)
-        offers = data.get('offers', [])
-        if not offers:
-            print(f"⚠️  No offer found to end for SKU {sku}")
-            return
-
-        item_id = offers[0].get('listing', {}).get('listingId')
+        offer_id, item_id = lookup_offer(sku, need_listing=True)
+        if not offer_id:
+            say(f"⚠️  No offer found to end for SKU {sku}")
+            return False, 'no offer found'
         if not item_id:
-            print(f"⚠️  No listingId found in offer for SKU {sku}")
-            return
+            say(f"⚠️  No listingId found in offer for SKU {sku}")
+            return False, 'no listing id'
 
         try:
-            api = Trading(
-                domain=EBAY_API_DOMAIN,
-                config_file=None,
-                appid=APP_ID,
-                certid=CERT_ID,
-                devid=DEV_ID,
-                token=USER_TOKEN,
-                siteid=EBAY_SITE_ID,
-                warnings=True
-            )
+            api = get_trading_api()
         except Exception as e:
-            print(f"❌ Failed to initialize eBay SDK: {str(e)}")
-            return
+            say(f"❌ Failed to initialize eBay SDK: {str(e)}")
+            return False, f"eBay SDK error: {e}"
 
         try:
             response = api.execute('EndFixedPriceItem', {'ItemID': item_id, 'EndingReason': 'NotAvailable'})
-            print(f"✅ End Listing [{sku}]:", response.dict())
+            say(f"✅ End Listing [{sku}]:", response.dict())
+            message = f"ended listing {item_id}"
         except ConnectionError as e:
-            if 'Code: 1047' in str(e):
-                print(f"✅ Listing [{sku}] is already ended.")
-            else:
-                raise
+            if 'Code: 1047' not in str(e):
+                say(f"❌ Trading API error while ending listing [{sku}]: {e}")
+                return False, f"Trading API error: {e}"
+            say(f"✅ Listing [{sku}] is already ended.")
+            message = f"listing {item_id} already ended"
+        get_state().update(sku, listing_id=None)
+        return True, message
+    except LookupError as e:
+        say(f"❌ {e}")
+        return False, str(e)
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network error while ending listing: {e}")
+        say(f"❌ Network error while ending listing: {e}")
+        return False, f"network error: {e}"
 
 def check_listing_status(sku):
     try:
-        r = requests.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=HEADERS)
-        if r.status_code != 200:
-            print(f"❌ Failed to fetch offer for SKU {sku}: {r.status_code}")
-            return
-        data = safe_json(r)
-        offers = data.get('offers', [])
-        if not offers:
+        offer_id, listing_id = lookup_offer(sku, need_listing=True)
+        if not offer_id:
             print(f"⚠️  No offer found for SKU {sku}")
             return
-
-        listing_id = offers[0].get('listing', {}).get('listingId')
         if not listing_id:
             print(f"⚠️  No listingId found in offer for SKU {sku}")
             return
 
         try:
-            api = Trading(
-                domain=EBAY_API_DOMAIN,
-                config_file=None,
-                appid=APP_ID,
-                certid=CERT_ID,
-                devid=DEV_ID,
-                token=USER_TOKEN,
-                siteid=EBAY_SITE_ID,
-                warnings=True
-            )
+            api = get_trading_api()
         except Exception as e:
             print(f"❌ Failed to initialize eBay SDK: {str(e)}")
             return
@@ -119,17 +154,251 @@ def check_listing_status(sku):
         response = api.execute('GetItem', {'ItemID': listing_id})
         status = response.dict().get('Item', {}).get('SellingStatus', {}).get('ListingStatus', 'UNKNOWN')
         print(f"ℹ️  Listing status for [{sku}] (ItemID {listing_id}): {status}")
+    except LookupError as e:
+        print(f"❌ {e}")
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error while checking listing status: {e}")
     except ConnectionError as e:
         print(f"❌ Trading API error while checking listing status: {e}")
 
+def as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def amount(value):
+    return value.get('value') if isinstance(value, dict) else value
+
+def list_inventory_skus():
+    skus = []
+    offset = 0
+    while True:
+        r = ebay_rest.get(f"{BASE_URL}/sell/inventory/v1/inventory_item", headers=auth_headers(SCOPES),
+                          params={'limit': PAGE_SIZE, 'offset': offset})
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to list inventory items: {r.status_code} {r.text}")
+        data = safe_json(r)
+        items = data.get('inventoryItems', [])
+        skus.extend(item['sku'] for item in items if item.get('sku', '').startswith(SKU_PREFIX))
+        offset += len(items)
+        if not items or offset >= data.get('total', 0):
+            return skus
+
+def selling_list_items(list_name, data):
+    section = data.get(list_name) or {}
+    if list_name != 'SoldList':
+        return as_list((section.get('ItemArray') or {}).get('Item'))
+    items = []
+    for order_transaction in as_list((section.get('OrderTransactionArray') or {}).get('OrderTransaction')):
+        transactions = as_list(order_transaction.get('Transaction'))
+        order = order_transaction.get('Order') or {}
+        transactions += as_list((order.get('TransactionArray') or {}).get('Transaction'))
+        items.extend(t.get('Item') or {} for t in transactions)
+    return items
+
+def fetch_listing_states(api):
+    # One paged GetMyeBaySelling sweep per list instead of a GetItem per SKU
+    states = {}
+    for list_name, status in SELLING_LISTS.items():
+        page = 1
+        while True:
+            response = api.execute('GetMyeBaySelling', {
+                list_name: {
+                    'Include': True,
+                    'Pagination': {'EntriesPerPage': PAGE_SIZE, 'PageNumber': page}
+                }
+            })
+            data = response.dict()
+            for item in selling_list_items(list_name, data):
+                sku = item.get('SKU')
+                if not sku or sku in states:
+                    continue
+                selling_status = item.get('SellingStatus') or {}
+                states[sku] = {
+                    'item_id': item.get('ItemID'),
+                    'status': status,
+                    'price': amount(selling_status.get('CurrentPrice') or item.get('BuyItNowPrice'))
+                }
+            pagination = (data.get(list_name) or {}).get('PaginationResult') or {}
+            if page >= int(pagination.get('TotalNumberOfPages') or 1):
+                break
+            page += 1
+    return states
+
+def collect_status_report(id_spec):
+    inventory_skus = list_inventory_skus()
+    states = fetch_listing_states(get_trading_api())
+    known = dict.fromkeys(inventory_skus + [sku for sku in states if sku.startswith(SKU_PREFIX)])
+    if id_spec.lower() in {'all', '--all'}:
+        skus = sorted(known)
+    else:
+        product_ids = parse_product_ids(id_spec, available=[sku[len(SKU_PREFIX):] for sku in known])
+        skus = [f"{SKU_PREFIX}{product_id}" for product_id in product_ids]
+
+    rows = []
+    for sku in skus:
+        state = states.get(sku, {})
+        if state:
+            status = state['status']
+        else:
+            status = 'Not listed' if sku in known else 'Not found'
+        rows.append({
+            'sku': sku,
+            'item_id': state.get('item_id') or '',
+            'status': status,
+            'price': state.get('price') or ''
+        })
+    return rows
+
+def print_status_table(rows):
+    print(f"{'SKU':<16} {'ItemID':<14} {'Status':<12} {'Price':>8}")
+    for row in rows:
+        print(f"{row['sku']:<16} {row['item_id']:<14} {row['status']:<12} {row['price']:>8}")
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    print(f"\n🧾 {len(rows)} SKU(s): " + ', '.join(f"{status} {count}" for status, count in sorted(counts.items())))
+
+def export_status(rows, csv_path=None, json_path=None):
+    if csv_path:
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['sku', 'item_id', 'status', 'price'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"✅ Status written to {csv_path}")
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        print(f"✅ Status written to {json_path}")
+
+def report_listing_status(id_spec, csv_path=None, json_path=None):
+    try:
+        rows = collect_status_report(id_spec)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error while collecting listing status: {e}")
+        return
+    except ConnectionError as e:
+        print(f"❌ Trading API error while collecting listing status: {e}")
+        return
+    print_status_table(rows)
+    export_status(rows, csv_path, json_path)
+
+def is_bulk_spec(spec):
+    return spec.lower() in {'all', '--all'} or any(c in spec for c in ',-@')
+
+def parse_export_options(args):
+    options = {}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in {'--csv', '--json'} and args:
+            options[arg[2:] + '_path'] = args.pop(0)
+        else:
+            return None
+    return options
+
+def read_sheet_prices(xlsx_path):
+    from sheet_cache import read_sheet  # only reprice needs the spreadsheet stack; keep other actions fast
+    df = read_sheet(xlsx_path, dtype={'id': str})
+    df = df[df['id'].notna() & df['price'].notna()]
+    return {f"{SKU_PREFIX}{product_id}": round(float(price), 2) for product_id, price in zip(df['id'], df['price'])}
+
+def find_price_changes(sheet_prices, states):
+    changes = {}
+    for sku, price in sheet_prices.items():
+        state = states.get(sku)
+        if not state or state['status'] != 'Active' or state.get('price') in (None, ''):
+            continue
+        if round(float(state['price']), 2) != price:
+            changes[sku] = (float(state['price']), price)
+    return changes
+
+def get_offer_id(sku):
+    try:
+        return lookup_offer(sku)[0]
+    except LookupError:
+        return None
+
+def bulk_update_prices(new_prices):
+    # new_prices: {sku: (offer_id, price)}; returns {sku: (ok, message)}
+    results = {}
+    skus = list(new_prices)
+    for chunk in chunked(skus):
+        responses, error = post_bulk(BASE_URL, auth_headers(SCOPES), 'bulk_update_price_quantity', [{
+            'sku': sku,
+            'offers': [{
+                'offerId': new_prices[sku][0],
+                'price': {'value': f"{new_prices[sku][1]:.2f}", 'currency': 'USD'}
+            }]
+        } for sku in chunk])
+        if error:
+            results.update({sku: (False, error) for sku in chunk})
+            continue
+        for entry in responses:
+            ok = entry.get('statusCode') == 200
+            results[entry.get('sku')] = (ok, 'price updated' if ok else format_errors(entry))
+    for sku in skus:
+        results.setdefault(sku, (False, 'no response for SKU in bulk price update'))
+    return results
+
+def reprice_listings(xlsx_path, id_spec='all', dry_run=False):
+    try:
+        sheet_prices = read_sheet_prices(xlsx_path)
+        if id_spec.lower() not in {'all', '--all'}:
+            selected = {f"{SKU_PREFIX}{product_id}" for product_id in parse_product_ids(id_spec)}
+            sheet_prices = {sku: price for sku, price in sheet_prices.items() if sku in selected}
+        sold = get_state().sold_skus()
+        if sold:
+            skipped = [sku for sku in sheet_prices if sku in sold]
+            sheet_prices = {sku: price for sku, price in sheet_prices.items() if sku not in sold}
+            if skipped:
+                print(f"ℹ️  Skipping {len(skipped)} sold SKU(s) (see orders.sync.py)")
+        states = fetch_listing_states(get_trading_api())
+    except (OSError, KeyError, ValueError) as e:
+        print(f"❌ Error reading pricing sheet: {e}")
+        return
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error while reading current prices: {e}")
+        return
+    except ConnectionError as e:
+        print(f"❌ Trading API error while reading current prices: {e}")
+        return
+
+    changes = find_price_changes(sheet_prices, states)
+    print(f"ℹ️  {len(changes)} of {len(sheet_prices)} priced SKU(s) differ from their live listing")
+    for sku, (old_price, new_price) in changes.items():
+        print(f"  💲 {sku}: {old_price:.2f} → {new_price:.2f}")
+    if dry_run or not changes:
+        return
+
+    try:
+        new_prices = {}
+        for sku, (_, new_price) in changes.items():
+            offer_id = get_offer_id(sku)
+            if offer_id:
+                new_prices[sku] = (offer_id, new_price)
+            else:
+                print(f"⚠️  No offer found for SKU {sku}")
+        results = bulk_update_prices(new_prices)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error while updating prices: {e}")
+        return
+
+    updated = sum(1 for ok, _ in results.values() if ok)
+    print(f"\n🧾 Repriced {updated}/{len(results)} SKU(s)")
+    for sku, (ok, message) in results.items():
+        if not ok:
+            print(f"  ❌ {sku}: {message}")
+
 def delete_offer_and_inventory(sku):
     try:
-        r = requests.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=HEADERS)
+        r = ebay_rest.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=auth_headers(SCOPES))
         if r.status_code != 200:
-            print(f"❌ Failed to fetch offers for SKU {sku}: {r.status_code}")
-            return
+            say(f"❌ Failed to fetch offers for SKU {sku}: {r.status_code}")
+            return False, f"offer lookup failed: {r.status_code}"
         offers = safe_json(r).get('offers', [])
         for offer in offers:
             listing = offer.get('listing', {})
@@ -141,43 +410,131 @@ def delete_offer_and_inventory(sku):
                 listing_status = listing.get('listingStatus')
                 if listing_status:
                     if listing_status.lower()=="active":
-                        print(f"⚠️ Cannot delete SKU {sku} — Active listing exists with listing status {listing_status}")
-                        return
+                        say(f"⚠️ Cannot delete SKU {sku} — Active listing exists with listing status {listing_status}")
+                        return False, f"active listing ({listing_status})"
             status = offer.get('status', {})
             if status:
                 if status.lower()=="published":
-                    print(f"⚠️ Cannot delete SKU {sku} — Active listing exists with status {status}")
-                    return
+                    say(f"⚠️ Cannot delete SKU {sku} — Active listing exists with status {status}")
+                    return False, f"active listing ({status})"
             offer_id = offer['offerId']
-            del_r = requests.delete(f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}", headers=HEADERS)
-            print(f"✅ Deleted Offer [{sku}] ID {offer_id}: {del_r.status_code}")
+            del_r = ebay_rest.delete(f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}", headers=auth_headers(SCOPES))
+            say(f"✅ Deleted Offer [{sku}] ID {offer_id}: {del_r.status_code}")
 
-        del_item_r = requests.delete(f"{BASE_URL}/sell/inventory/v1/inventory_item/{sku}", headers=HEADERS)
-        print(f"✅ Deleted Inventory Item [{sku}]:", del_item_r.status_code)
+        del_item_r = ebay_rest.delete(f"{BASE_URL}/sell/inventory/v1/inventory_item/{sku}", headers=auth_headers(SCOPES))
+        say(f"✅ Deleted Inventory Item [{sku}]:", del_item_r.status_code)
         if del_item_r.status_code != 204:
-            print(safe_json(del_item_r))
+            say(safe_json(del_item_r))
+            return False, f"inventory item delete failed: {error_message(del_item_r)}"
+        get_state().forget(sku)
+        return True, f"deleted ({len(offers)} offer(s))"
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network error during deletion: {e}")
+        say(f"❌ Network error during deletion: {e}")
+        return False, f"network error: {e}"
+
+SKU_ACTIONS = {
+    'publish': publish_offer,
+    'end': end_listing,
+    'delete': delete_offer_and_inventory
+}
+
+def select_skus(id_spec):
+    if id_spec.lower() in {'all', '--all'}:
+        return list_inventory_skus()
+    return [f"{SKU_PREFIX}{product_id}" for product_id in parse_product_ids(id_spec)]
+
+def run_sku_action(action, skus, workers=DEFAULT_WORKERS):
+    get_state()  # open the state store before the worker threads share it
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = dict(zip(skus, executor.map(SKU_ACTIONS[action], skus)))
+    print_action_summary(action, results)
+    return results
+
+def print_action_summary(action, results):
+    succeeded = sum(1 for ok, _ in results.values() if ok)
+    print(f"\n🧾 {action.capitalize()} summary: {succeeded}/{len(results)} succeeded")
+    for sku, (ok, message) in results.items():
+        print(f"  {'✅' if ok else '❌'} {sku}: {message}")
+
+def parse_workers(args):
+    args = list(args)
+    workers = DEFAULT_WORKERS
+    if args[:1] == ['--workers'] and len(args) == 2 and args[1].isdigit() and int(args[1]) > 0:
+        workers = int(args[1])
+    elif args:
+        return None
+    return workers
 
 def main():
     valid_actions = {'publish', 'end', 'delete', 'status'}
+    script = os.path.basename(__file__)
+    if len(sys.argv) >= 3 and sys.argv[1] == 'status' and (len(sys.argv) > 3 or is_bulk_spec(sys.argv[2])):
+        options = parse_export_options(sys.argv[3:])
+        if options is None:
+            print(f"Usage: python {script} status <--all|product_ids|first-last|@ids.txt> [--csv file] [--json file]")
+            sys.exit(1)
+        report_listing_status(sys.argv[2], **options)
+        return
+
+    if len(sys.argv) >= 3 and sys.argv[1] == 'reprice':
+        args = sys.argv[2:]
+        dry_run = '--dry-run' in args
+        args = [arg for arg in args if arg != '--dry-run']
+        if len(args) not in {1, 2}:
+            print(f"Usage: python {script} reprice <pricing.xlsx> [product_ids|first-last|all|@ids.txt] [--dry-run]")
+            sys.exit(1)
+        if not os.path.exists(args[0]):
+            sys.exit(f"❌ File not found: {args[0]}")
+        reprice_listings(args[0], args[1] if len(args) == 2 else 'all', dry_run)
+        return
+
+    if len(sys.argv) >= 3 and sys.argv[1] in SKU_ACTIONS and (len(sys.argv) > 3 or is_bulk_spec(sys.argv[2])):
+        args = sys.argv[3:]
+        confirmed = '--yes' in args
+        workers = parse_workers([arg for arg in args if arg != '--yes'])
+        if workers is None:
+            print(f"Usage: python {script} {sys.argv[1]} <product_ids|first-last|all|@ids.txt> [--workers N] [--yes]")
+            sys.exit(1)
+        try:
+            skus = select_skus(sys.argv[2])
+        except (RuntimeError, ValueError) as e:
+            sys.exit(f"❌ {e}")
+        except requests.exceptions.RequestException as e:
+            sys.exit(f"❌ Network error while listing inventory items: {e}")
+        if sys.argv[1] == 'publish':
+            sold = get_state().sold_skus()
+            for sku in skus:
+                if sku in sold:
+                    print(f"ℹ️  Skipping {sku}: sold {sold[sku]}")
+            skus = [sku for sku in skus if sku not in sold]
+        if not skus:
+            sys.exit("❌ No SKUs selected")
+        print(f"📋 {len(skus)} SKU(s) selected for {sys.argv[1]}")
+        # Ending or deleting every listing is not undoable, so `all` has to be confirmed
+        if sys.argv[1] in {'end', 'delete'} and sys.argv[2].lower() in {'all', '--all'} and not confirmed:
+            sys.exit(f"❌ Refusing to {sys.argv[1]} all {len(skus)} SKU(s) without --yes")
+        results = run_sku_action(sys.argv[1], skus, workers)
+        if not all(ok for ok, _ in results.values()):
+            sys.exit(1)
+        return
+
     if len(sys.argv) != 3 or sys.argv[1] not in valid_actions:
-        script = os.path.basename(__file__)
         print(f"Usage: python {script} <{'|'.join(sorted(valid_actions))}> <product_id>")
+        print(f"       python {script} <delete|end|publish> <product_ids|first-last|all|@ids.txt> [--workers N] [--yes]")
+        print(f"       python {script} status <--all|product_ids|first-last|@ids.txt> [--csv file] [--json file]")
+        print(f"       python {script} reprice <pricing.xlsx> [product_ids|first-last|all|@ids.txt] [--dry-run]")
         sys.exit(1)
 
     action = sys.argv[1]
     product_id = sys.argv[2]
     sku = f"DIECAST-{product_id}"
 
-    if action == 'publish':
-        publish_offer(sku)
-    elif action == 'end':
-        end_listing(sku)
-    elif action == 'status':
+    if action == 'status':
         check_listing_status(sku)
-    elif action == 'delete':
-        delete_offer_and_inventory(sku)
+    elif action == 'publish' and sku in get_state().sold_skus():
+        sys.exit(f"❌ {sku} is marked as sold; clear it with orders.sync.py --unmark {product_id} to relist")
+    else:
+        SKU_ACTIONS[action](sku)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
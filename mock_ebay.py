@@ -0,0 +1,566 @@
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+# Offline stand-in for the eBay endpoints the scripts call: Identity (token
+# refresh), Inventory, Account policies, Fulfillment orders, the Trading calls
+# (UploadSiteHostedPictures, GetItem, EndFixedPriceItem, GetMyeBaySelling) and
+# the S3 photo URLs, all kept in memory. Start it and point the scripts at it:
+#   python3 mock_ebay.py [--port 8765] [--latency 0.05] [--throttle 0.02] [--rate-limit 50]
+#   EBAY_API_BASE_URL=http://127.0.0.1:8765 python3 stock.py batch ...
+# --latency delays every response by about that many seconds; --throttle answers
+# that fraction of REST calls with 429 and --rate-limit caps REST calls per
+# second, both with a Retry-After header. POST /mock/sell/<sku> sells a listing,
+# GET /mock/stats returns call counts and response times.
+
+DEFAULT_PORT = 8765
+PAGE_LIMIT = 200
+PHOTO_BUCKET = 'ebay.photos'
+TRADING_NS = 'urn:ebay:apis:eBLBaseComponents'
+POLICY_TYPES = ('fulfillment_policy', 'payment_policy', 'return_policy')
+ID_SEGMENT = re.compile(r'/(?:DIECAST-[^/]+|\d{5,})')  # SKUs and ids, grouped in the call counts
+DEFAULT_POLICY_NAMES = {
+    'fulfillment_policy': 'Standard Shipping',
+    'payment_policy': 'Standard Payment',
+    'return_policy': 'Standard Return'
+}
+
+def now_iso(offset=timedelta()):
+    value = datetime.now(timezone.utc) + offset
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+
+def policy_id_field(policy_type):
+    return f"{policy_type.split('_')[0]}PolicyId"
+
+def error(error_id, message, parameters=None):
+    entry = {'errorId': error_id, 'domain': 'API_INVENTORY', 'category': 'REQUEST', 'message': message}
+    if parameters:
+        entry['parameters'] = [{'name': name, 'value': value} for name, value in parameters.items()]
+    return entry
+
+def to_xml(tag, value):
+    if isinstance(value, list):
+        return ''.join(to_xml(tag, item) for item in value)
+    if isinstance(value, dict):
+        attrs = ''.join(f' {name[1:]}="{escape(str(v))}"' for name, v in value.items() if name.startswith('@'))
+        text = escape(str(value['#text'])) if '#text' in value else ''
+        children = ''.join(to_xml(name, v) for name, v in value.items() if not name.startswith(('@', '#')))
+        return f"<{tag}{attrs}>{text}{children}</{tag}>"
+    return f"<{tag}>{escape(str(value))}</{tag}>"
+
+def xml_text(root, path, default=None):
+    node = root.find(path, {'e': TRADING_NS})
+    return node.text if node is not None and node.text is not None else default
+
+class MockEbay:
+    def __init__(self, latency=0.0, throttle=0.0, rate_limit=None, retry_after=1, seed=None):
+        self.latency = latency
+        self.throttle = throttle
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.verbose = False
+        self.base_url = ''
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.items = {}
+            self.offers = {}
+            self.offer_by_sku = {}
+            self.listings = {}
+            self.orders = []
+            self.locations = {}
+            self.policies = {policy_type: {} for policy_type in POLICY_TYPES}
+            self.next_id = 100000
+            self.calls = Counter()
+            self.throttled = 0
+            self.timings = []
+            self.window = [0, 0]
+        for policy_type, name in DEFAULT_POLICY_NAMES.items():
+            self.create_policy(policy_type, {'name': name, 'marketplaceId': 'EBAY_US'})
+
+    def new_id(self):
+        self.next_id += 1
+        return str(self.next_id)
+
+    # --- injected latency and throttling ---
+
+    def delay(self):
+        if self.latency:
+            time.sleep(self.latency * self.random.uniform(0.5, 1.5))
+
+    def should_throttle(self):
+        with self.lock:
+            if self.rate_limit:
+                second = int(time.time())
+                if self.window[0] != second:
+                    self.window = [second, 0]
+                self.window[1] += 1
+                if self.window[1] > self.rate_limit:
+                    self.throttled += 1
+                    return True
+            if self.throttle and self.random.random() < self.throttle:
+                self.throttled += 1
+                return True
+        return False
+
+    def record(self, name, elapsed):
+        with self.lock:
+            self.calls[name] += 1
+            self.timings.append(elapsed)
+
+    def stats(self):
+        with self.lock:
+            timings = sorted(self.timings)
+            return {
+                'calls': dict(self.calls),
+                'requests': len(timings),
+                'throttled': self.throttled,
+                'mean_ms': round(1000 * sum(timings) / len(timings), 2) if timings else 0,
+                'p95_ms': round(1000 * timings[math.ceil(0.95 * len(timings)) - 1], 2) if timings else 0,
+                'listings': Counter(listing['status'] for listing in self.listings.values()),
+                'orders': len(self.orders)
+            }
+
+    # --- Account ---
+
+    def create_policy(self, policy_type, payload):
+        policy_id = self.new_id()
+        policy = dict(payload, **{policy_id_field(policy_type): policy_id})
+        self.policies[policy_type][policy_id] = policy
+        return policy
+
+    # --- Inventory ---
+
+    def put_item(self, sku, payload):
+        created = sku not in self.items
+        self.items[sku] = payload
+        return 201 if created else 204
+
+    def create_offer(self, payload):
+        sku = payload.get('sku')
+        if sku not in self.items:
+            return 400, {'errors': [error(25702, f"The SKU {sku} is not available in the system.")]}
+        if sku in self.offer_by_sku:
+            offer_id = self.offer_by_sku[sku]
+            return 400, {'errors': [error(25002, 'Offer entity already exists.', {'offerId': offer_id})]}
+        offer_id = self.new_id()
+        self.offers[offer_id] = dict(payload, offerId=offer_id, status='UNPUBLISHED')
+        self.offer_by_sku[sku] = offer_id
+        return 201, {'offerId': offer_id}
+
+    def publish_offer(self, offer_id):
+        offer = self.offers.get(offer_id)
+        if not offer:
+            return 404, {'errors': [error(25713, 'This Offer is not available.')]}
+        listing = offer.get('listing') or {}
+        listing_id = listing.get('listingId')
+        if not listing_id or self.listings[listing_id]['status'] != 'Active':
+            listing_id = self.new_id()
+        price = (offer.get('pricingSummary') or {}).get('price') or {}
+        self.listings[listing_id] = {'sku': offer['sku'], 'status': 'Active', 'price': str(price.get('value', '0'))}
+        offer['status'] = 'PUBLISHED'
+        offer['listing'] = {'listingId': listing_id, 'listingStatus': 'ACTIVE'}
+        return 200, {'offerId': offer_id, 'listingId': listing_id}
+
+    def listing_status(self, listing_id, status):
+        listing = self.listings[listing_id]
+        listing['status'] = status
+        offer = self.offers.get(self.offer_by_sku.get(listing['sku']))
+        if offer and offer.get('listing', {}).get('listingId') == listing_id:
+            offer['listing']['listingStatus'] = 'ACTIVE' if status == 'Active' else status.upper()
+            offer['status'] = 'PUBLISHED' if status == 'Active' else 'UNPUBLISHED'
+
+    def handle_rest(self, method, path, query, body):
+        parts = path.strip('/').split('/')
+        if path == '/identity/v1/oauth2/token' and method == 'POST':
+            return 200, {'access_token': f"mock-{self.new_id()}", 'expires_in': 7200, 'token_type': 'User Access Token'}
+
+        if parts[:3] == ['sell', 'account', 'v1']:
+            if parts[3] == 'program':
+                if parts[4:] == ['get_opted_in_programs']:
+                    return 200, {'programs': [{'programType': 'SELLING_POLICY_MANAGEMENT'}]}
+                return 200, {}
+            policy_type = parts[3]
+            if policy_type not in POLICY_TYPES:
+                return 404, {'errors': [error(20404, f"Unknown resource {path}")]}
+            if len(parts) == 4 and method == 'GET':
+                policies = list(self.policies[policy_type].values())
+                return 200, {'total': len(policies), f"{policy_type.split('_')[0]}Policies": policies}
+            if len(parts) == 4 and method == 'POST':
+                return 201, self.create_policy(policy_type, body or {})
+            policy_id = parts[4] if len(parts) > 4 else None
+            if policy_id not in self.policies[policy_type]:
+                return 404, {'errors': [error(20404, f"Policy {policy_id} not found")]}
+            if method == 'PUT':
+                self.policies[policy_type][policy_id] = dict(body or {}, **{policy_id_field(policy_type): policy_id})
+                return 200, self.policies[policy_type][policy_id]
+            if method == 'DELETE':
+                del self.policies[policy_type][policy_id]
+                return 204, None
+            return 200, self.policies[policy_type][policy_id]
+
+        if parts[:3] == ['sell', 'inventory', 'v1']:
+            return self.handle_inventory(method, parts[3:], query, body)
+
+        if parts[:4] == ['sell', 'fulfillment', 'v1', 'order'] and method == 'GET':
+            return self.get_orders(query)
+
+        return 404, {'errors': [error(20404, f"Unknown resource {method} {path}")]}
+
+    def handle_inventory(self, method, parts, query, body):
+        resource = parts[0] if parts else ''
+        if resource == 'location':
+            self.locations[parts[1]] = body
+            return 204, None
+
+        if resource == 'inventory_item':
+            if len(parts) == 1:
+                offset, limit = int(query.get('offset', 0)), min(int(query.get('limit', 25)), PAGE_LIMIT)
+                skus = sorted(self.items)
+                return 200, {'total': len(skus), 'inventoryItems': [dict(self.items[sku], sku=sku) for sku in skus[offset:offset + limit]]}
+            sku = parts[1]
+            if method == 'PUT':
+                return self.put_item(sku, body), None
+            if sku not in self.items:
+                return 404, {'errors': [error(25710, f"SKU {sku} not found")]}
+            if method == 'DELETE':
+                del self.items[sku]
+                offer_id = self.offer_by_sku.pop(sku, None)
+                self.offers.pop(offer_id, None)
+                return 204, None
+            return 200, dict(self.items[sku], sku=sku)
+
+        if resource == 'bulk_create_or_replace_inventory_item':
+            responses = []
+            for request in body.get('requests', []):
+                sku = request.get('sku')
+                responses.append({'sku': sku, 'statusCode': self.put_item(sku, request), 'locale': 'en_US'})
+            return 207, {'responses': responses}
+
+        if resource == 'bulk_create_offer':
+            responses = []
+            for request in body.get('requests', []):
+                status, data = self.create_offer(request)
+                responses.append(dict(data, sku=request.get('sku'), statusCode=status))
+            return 207, {'responses': responses}
+
+        if resource == 'bulk_publish_offer':
+            responses = []
+            for request in body.get('requests', []):
+                status, data = self.publish_offer(request.get('offerId'))
+                responses.append(dict(data, offerId=request.get('offerId'), statusCode=status))
+            return 207, {'responses': responses}
+
+        if resource == 'bulk_update_price_quantity':
+            responses = []
+            for request in body.get('requests', []):
+                sku = request.get('sku')
+                for offer in request.get('offers', []):
+                    stored = self.offers.get(offer.get('offerId'))
+                    if not stored:
+                        responses.append({'sku': sku, 'offerId': offer.get('offerId'), 'statusCode': 404,
+                                          'errors': [error(25713, 'This Offer is not available.')]})
+                        continue
+                    stored['pricingSummary'] = {'price': offer.get('price')}
+                    listing_id = stored.get('listing', {}).get('listingId')
+                    if listing_id in self.listings:
+                        self.listings[listing_id]['price'] = str(offer['price']['value'])
+                    responses.append({'sku': sku, 'offerId': offer.get('offerId'), 'statusCode': 200})
+            return 207, {'responses': responses}
+
+        if resource == 'offer':
+            if len(parts) == 1 and method == 'GET':
+                sku = query.get('sku')
+                if sku not in self.items:
+                    return 404, {'errors': [error(25702, f"The SKU {sku} is not available in the system.")]}
+                offer_id = self.offer_by_sku.get(sku)
+                offers = [self.offers[offer_id]] if offer_id else []
+                return 200, {'total': len(offers), 'offers': offers}
+            if len(parts) == 1 and method == 'POST':
+                return self.create_offer(body or {})
+            offer_id = parts[1]
+            if len(parts) == 3 and parts[2] == 'publish':
+                return self.publish_offer(offer_id)
+            if offer_id not in self.offers:
+                return 404, {'errors': [error(25713, 'This Offer is not available.')]}
+            if method == 'PUT':
+                self.offers[offer_id].update(body or {})
+                return 204, None
+            if method == 'DELETE':
+                offer = self.offers.pop(offer_id)
+                self.offer_by_sku.pop(offer['sku'], None)
+                return 204, None
+            return 200, self.offers[offer_id]
+
+        return 404, {'errors': [error(20404, f"Unknown inventory resource {'/'.join(parts)}")]}
+
+    # --- Fulfillment ---
+
+    def sell(self, sku):
+        offer = self.offers.get(self.offer_by_sku.get(sku))
+        listing_id = (offer or {}).get('listing', {}).get('listingId')
+        if not listing_id or self.listings[listing_id]['status'] != 'Active':
+            return 404, {'errors': [error(20404, f"No active listing for {sku}")]}
+        self.listing_status(listing_id, 'Completed')
+        created = now_iso()
+        order = {
+            'orderId': f"{self.new_id()}-{self.new_id()}",
+            'creationDate': created,
+            'lastModifiedDate': created,
+            'orderFulfillmentStatus': 'NOT_STARTED',
+            'orderPaymentStatus': 'PAID',
+            'lineItems': [{'lineItemId': self.new_id(), 'sku': sku, 'legacyItemId': listing_id, 'quantity': 1}]
+        }
+        self.orders.append(order)
+        return 201, order
+
+    def get_orders(self, query):
+        match = re.search(r'lastmodifieddate:\[([^.\]]*(?:\.\d+)?Z?)\.\.', query.get('filter', ''))
+        since = match.group(1) if match else ''
+        orders = [order for order in self.orders if order['lastModifiedDate'] >= since]
+        offset, limit = int(query.get('offset', 0)), min(int(query.get('limit', 50)), PAGE_LIMIT)
+        page = {'total': len(orders), 'offset': offset, 'limit': limit, 'orders': orders[offset:offset + limit]}
+        if offset + limit < len(orders):
+            filter_value = quote(query.get('filter', ''))
+            page['next'] = f"{self.base_url}/sell/fulfillment/v1/order?filter={filter_value}&limit={limit}&offset={offset + limit}"
+        return 200, page
+
+    # --- Trading ---
+
+    def handle_trading(self, verb, body):
+        root = ElementTree.fromstring(body) if body else None
+        if verb == 'UploadSiteHostedPictures':
+            source = xml_text(root, 'e:ExternalPictureURL', '')
+            digest = hashlib.sha1(source.encode()).hexdigest()[:16]
+            return 'Success', {'SiteHostedPictureDetails': {
+                'FullURL': f"https://i.ebayimg.com/00/s/MTYwMFgxMjAw/z/{digest}/$_1.JPG",
+                'BaseURL': f"https://i.ebayimg.com/00/s/MTYwMFgxMjAw/z/{digest}/$_",
+                'PictureFormat': 'JPG',
+                'UseByDate': now_iso(timedelta(days=30))
+            }}
+        if verb == 'GetItem':
+            item_id = xml_text(root, 'e:ItemID')
+            listing = self.listings.get(item_id)
+            if not listing:
+                return self.trading_error(17, 'This item cannot be accessed because the listing has been deleted or you are not the seller.')
+            return 'Success', {'Item': {
+                'ItemID': item_id,
+                'SKU': listing['sku'],
+                'SellingStatus': {
+                    'CurrentPrice': {'@currencyID': 'USD', '#text': listing['price']},
+                    'ListingStatus': listing['status']
+                }
+            }}
+        if verb == 'EndFixedPriceItem':
+            item_id = xml_text(root, 'e:ItemID')
+            listing = self.listings.get(item_id)
+            if not listing:
+                return self.trading_error(17, 'This item cannot be accessed because the listing has been deleted or you are not the seller.')
+            if listing['status'] != 'Active':
+                return self.trading_error(1047, 'The auction has already been closed.')
+            self.listing_status(item_id, 'Ended')
+            return 'Success', {'EndTime': now_iso()}
+        if verb == 'GetMyeBaySelling':
+            return 'Success', self.my_ebay_selling(root)
+        return self.trading_error(2, f"Unsupported API call {verb} in mock server.")
+
+    def trading_error(self, code, message):
+        return 'Failure', {'Errors': {
+            'ShortMessage': message,
+            'LongMessage': message,
+            'ErrorCode': code,
+            'SeverityCode': 'Error',
+            'ErrorClassification': 'RequestError'
+        }}
+
+    def my_ebay_selling(self, root):
+        statuses = {'ActiveList': 'Active', 'SoldList': 'Completed', 'UnsoldList': 'Ended'}
+        reply = {}
+        for list_name, status in statuses.items():
+            section = root.find(f"e:{list_name}", {'e': TRADING_NS})
+            if section is None:
+                continue
+            per_page = int(xml_text(section, 'e:Pagination/e:EntriesPerPage', 25))
+            page = int(xml_text(section, 'e:Pagination/e:PageNumber', 1))
+            matches = [(item_id, listing) for item_id, listing in sorted(self.listings.items()) if listing['status'] == status]
+            items = [{
+                'ItemID': item_id,
+                'SKU': listing['sku'],
+                'SellingStatus': {'CurrentPrice': {'@currencyID': 'USD', '#text': listing['price']}}
+            } for item_id, listing in matches[(page - 1) * per_page:page * per_page]]
+            pages = max(1, -(-len(matches) // per_page))
+            pagination = {'TotalNumberOfEntries': len(matches), 'TotalNumberOfPages': pages}
+            if list_name == 'SoldList':
+                reply[list_name] = {
+                    'OrderTransactionArray': {'OrderTransaction': [{'Transaction': {'Item': item}} for item in items]},
+                    'PaginationResult': pagination
+                }
+            else:
+                reply[list_name] = {'ItemArray': {'Item': items}, 'PaginationResult': pagination}
+        return reply
+
+    # --- S3 photos ---
+
+    def photo(self, path):
+        # Deterministic bytes per URL, so ETags (the EPS cache keys) are stable between runs
+        seed = hashlib.sha256(path.encode()).digest()
+        return b'\xff\xd8\xff\xe0' + seed * 64 + b'\xff\xd9'
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            if mock.verbose:
+                super().log_message(format, *args)
+
+        def send(self, status, body=b'', content_type='application/json', headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def read_body(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length) if length else b''
+
+        def dispatch(self, method):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            raw = self.read_body()
+            mock.delay()
+
+            if url.path == '/ws/api.dll':
+                verb = self.headers.get('X-EBAY-API-CALL-NAME', '')
+                with mock.lock:
+                    ack, reply = mock.handle_trading(verb, raw)
+                xml = (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><{verb}Response xmlns=\"{TRADING_NS}\">"
+                       f"<Timestamp>{now_iso()}</Timestamp><Ack>{ack}</Ack><Version>1193</Version>"
+                       + ''.join(to_xml(name, value) for name, value in reply.items())
+                       + f"</{verb}Response>")
+                self.send(200, xml.encode(), 'text/xml')
+                mock.record(f"Trading {verb}", time.perf_counter() - start)
+                return
+
+            if url.path.startswith(f"/{PHOTO_BUCKET}/") and method in {'GET', 'HEAD'}:
+                data = mock.photo(url.path)
+                self.send(200, data, 'image/jpeg', {'ETag': f'"{hashlib.md5(data).hexdigest()}"'})
+                mock.record(f"S3 {method} photo", time.perf_counter() - start)
+                return
+
+            if url.path.startswith('/mock/'):
+                if url.path == '/mock/stats':
+                    status, data = 200, mock.stats()
+                elif url.path == '/mock/reset' and method == 'POST':
+                    mock.reset()
+                    status, data = 200, {}
+                elif url.path.startswith('/mock/sell/') and method == 'POST':
+                    with mock.lock:
+                        status, data = mock.sell(url.path.rsplit('/', 1)[1])
+                else:
+                    status, data = 404, {}
+                self.send(status, json.dumps(data).encode())
+                return
+
+            name = f"{method} {ID_SEGMENT.sub('/{id}', url.path)}"
+            if mock.should_throttle():
+                self.send(429, json.dumps({'errors': [error(2001, 'Too many requests. The request limit has been reached.')]}).encode(),
+                          headers={'Retry-After': str(mock.retry_after)})
+                mock.record(f"{name} (429)", time.perf_counter() - start)
+                return
+            try:
+                body = json.loads(raw) if raw and self.headers.get('Content-Type', '').startswith('application/json') else None
+            except ValueError:
+                self.send(400, json.dumps({'errors': [error(2004, 'Invalid JSON body')]}).encode())
+                return
+            with mock.lock:
+                status, data = mock.handle_rest(method, url.path, query, body)
+            self.send(status, json.dumps(data).encode() if data is not None else b'')
+            mock.record(name, time.perf_counter() - start)
+
+        def do_GET(self):
+            self.dispatch('GET')
+
+        def do_HEAD(self):
+            self.dispatch('HEAD')
+
+        def do_POST(self):
+            self.dispatch('POST')
+
+        def do_PUT(self):
+            self.dispatch('PUT')
+
+        def do_DELETE(self):
+            self.dispatch('DELETE')
+
+    return Handler
+
+def start_server(mock, port=DEFAULT_PORT, host='127.0.0.1', verbose=False):
+    # Serves on a background thread; port 0 picks a free port
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    mock.verbose = verbose
+    mock.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def parse_options(args):
+    options = {'port': DEFAULT_PORT, 'latency': 0.0, 'throttle': 0.0, 'rate_limit': None, 'retry_after': 1, 'verbose': False}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == '--verbose':
+            options['verbose'] = True
+            continue
+        if arg not in ('--port', '--latency', '--throttle', '--rate-limit', '--retry-after') or not args:
+            return None
+        try:
+            value = float(args.pop(0))
+        except ValueError:
+            return None
+        if value < 0 or (arg == '--throttle' and value > 1):
+            return None
+        key = arg[2:].replace('-', '_')
+        options[key] = int(value) if key in ('port', 'rate_limit', 'retry_after') else value
+    return options
+
+def main():
+    options = parse_options(sys.argv[1:])
+    if options is None:
+        script = os.path.basename(__file__)
+        print(f"Usage: python {script} [--port {DEFAULT_PORT}] [--latency seconds] [--throttle 0-1] [--rate-limit calls/s] [--retry-after seconds] [--verbose]")
+        sys.exit(1)
+
+    mock = MockEbay(options['latency'], options['throttle'], options['rate_limit'], options['retry_after'])
+    server = start_server(mock, options['port'], verbose=options['verbose'])
+    print(f"🧪 Mock eBay API on {mock.base_url}")
+    print(f"   export EBAY_API_BASE_URL={mock.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n🧾 " + json.dumps(mock.stats()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+import requests
+import ebay_rest
+from ebay_config import ENV
+from token_cache import auth_headers
+from inventory_state import InventoryState
+from product_ids import parse_product_ids
+
+# Polls the Fulfillment API for orders created or changed since the last run
+# (lastModifiedDate watermark in the inventory state database) and marks the
+# sold SKUs, which stock.py and manage.py reprice/publish then leave alone.
+
+SCOPES = [
+    'https://api.ebay.com/oauth/api_scope/sell.fulfillment'
+]
+BASE_URL = 'https://api.sandbox.ebay.com' if ENV == 'sandbox' else 'https://api.ebay.com'
+SKU_PREFIX = 'DIECAST-'
+PAGE_SIZE = 200  # largest page getOrders allows
+FIRST_SYNC_DAYS = 90  # getOrders' own default window, used when there is no watermark yet
+OVERLAP = timedelta(minutes=5)  # re-read recent changes in case eBay indexed them late
+WATERMARK = 'orders.last_modified'
+
+def safe_json(r):
+    try:
+        return r.json()
+    except ValueError:
+        return {}
+
+def format_timestamp(value):
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def sync_start(watermark):
+    if watermark:
+        return format_timestamp(parse_timestamp(watermark) - OVERLAP)
+    return format_timestamp(datetime.now(timezone.utc) - timedelta(days=FIRST_SYNC_DAYS))
+
+def fetch_orders(since):
+    # Orders modified at or after `since`, following eBay's `next` page links
+    url = f"{BASE_URL}/sell/fulfillment/v1/order"
+    params = {'filter': f"lastmodifieddate:[{since}..]", 'limit': PAGE_SIZE}
+    while url:
+        r = ebay_rest.get(url, headers=auth_headers(SCOPES), params=params)
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to fetch orders: {r.status_code} {r.text}")
+        data = safe_json(r)
+        yield from data.get('orders', [])
+        url, params = data.get('next'), None
+
+def is_cancelled(order):
+    return (order.get('cancelStatus') or {}).get('cancelState') == 'CANCELED'
+
+def order_skus(order):
+    return [item['sku'] for item in order.get('lineItems', []) if item.get('sku', '').startswith(SKU_PREFIX)]
+
+def sync_orders(state, since=None):
+    watermark = state.get_sync_value(WATERMARK)
+    start = since or sync_start(watermark)
+    print(f"🔄 Fetching orders modified since {start}")
+    sold, released = {}, []
+    newest = watermark
+    orders = 0
+    for order in fetch_orders(start):
+        orders += 1
+        order_id = order.get('orderId')
+        for sku in order_skus(order):
+            record = state.get(sku) or {}
+            if is_cancelled(order):
+                if record.get('order_id') == order_id:
+                    state.clear_sold(sku)
+                    released.append(sku)
+            elif record.get('order_id') != order_id:
+                state.mark_sold(sku, order_id, order.get('creationDate') or format_timestamp(datetime.now(timezone.utc)))
+                sold[sku] = order_id
+        modified = order.get('lastModifiedDate')
+        if modified and (newest is None or parse_timestamp(modified) > parse_timestamp(newest)):
+            newest = modified
+    # Only advanced once every page was read, so a failed poll is simply retried
+    if newest:
+        state.set_sync_value(WATERMARK, newest)
+    return orders, sold, released
+
+def unmark_sold(state, id_spec):
+    for product_id in parse_product_ids(id_spec):
+        sku = f"{SKU_PREFIX}{product_id}"
+        if (state.get(sku) or {}).get('sold_at'):
+            state.clear_sold(sku)
+            print(f"✅ {sku} is no longer marked as sold")
+        else:
+            print(f"ℹ️  {sku} was not marked as sold")
+
+def main():
+    args = sys.argv[1:]
+    script = os.path.basename(__file__)
+    valid = (not args) or (len(args) == 2 and args[0] in {'--since', '--unmark'})
+    if not valid:
+        print(f"Usage: python {script} [--since 2026-01-01T00:00:00.000Z]")
+        print(f"       python {script} --unmark <product_ids|first-last|@ids.txt>")
+        sys.exit(1)
+
+    state = InventoryState(ENV)
+    try:
+        if args and args[0] == '--unmark':
+            unmark_sold(state, args[1])
+            return
+        if args:
+            try:
+                since = format_timestamp(parse_timestamp(args[1]))
+            except ValueError:
+                sys.exit(f"❌ Invalid timestamp: {args[1]}")
+        else:
+            since = None
+        orders, sold, released = sync_orders(state, since)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    except requests.exceptions.RequestException as e:
+        sys.exit(f"❌ Network error while fetching orders: {e}")
+    finally:
+        state.close()
+
+    for sku, order_id in sold.items():
+        print(f"💰 {sku} sold (order {order_id})")
+    for sku in released:
+        print(f"↩️  {sku} order cancelled, available again")
+    print(f"\n🧾 {orders} order(s) checked: {len(sold)} newly sold, {len(released)} cancelled")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import os
+from local_cache import cache_path, file_sha256, load_json, save_json
+
+try:
+    from PIL import Image, ImageOps  # optional: only photos.optimize.py needs Pillow
+except ImportError:
+    Image = ImageOps = None
+
+# Phone photos are resized to eBay's recommended 1600px longest side,
+# auto-rotated from their EXIF orientation and re-encoded as JPEG without the
+# EXIF/XMP metadata (the ICC color profile is kept). The manifest remembers
+# the source hash and settings behind every output so unchanged photos are
+# skipped on the next run.
+
+SOURCE_DIR = 'photos'
+OUTPUT_DIR = 'photos.optimized'
+MAX_DIMENSION = 1600
+QUALITY = 85
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tif', '.tiff'}
+
+def settings_key(max_dimension, quality):
+    return f"{max_dimension}px-q{quality}"
+
+def output_name(filename, shared_stems=()):
+    # a.jpg and a.png would both become a.jpg; those keep their extension (a.png.jpg)
+    stem = os.path.splitext(filename)[0]
+    return (filename if stem.lower() in shared_stems else stem) + '.jpg'
+
+def shared_stems(filenames):
+    stems = [os.path.splitext(filename)[0].lower() for filename in filenames]
+    return {stem for stem in stems if stems.count(stem) > 1}
+
+def optimize_image(source, target, max_dimension=MAX_DIMENSION, quality=QUALITY):
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        icc_profile = original.info.get('icc_profile')
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        image.save(tmp_path, 'JPEG', quality=quality, optimize=True, progressive=True, icc_profile=icc_profile)
+        os.replace(tmp_path, target)
+
+def optimize_job(job):
+    # Runs in a worker process: (source, target, known source hash, max px, quality)
+    source, target, known_hash, max_dimension, quality = job
+    digest = file_sha256(source)
+    if digest == known_hash and os.path.exists(target):
+        return source, target, digest, 'cached'
+    try:
+        optimize_image(source, target, max_dimension, quality)
+    except (OSError, ValueError) as e:
+        return source, target, digest, f"failed: {e}"
+    return source, target, digest, 'optimized'
+
+def manifest_path():
+    return cache_path('photos.optimized.json')
+
+def load_manifest():
+    return load_json(manifest_path())
+
+def save_manifest(manifest):
+    save_json(manifest_path(), manifest, indent=1, sort_keys=True)
+
+def product_jobs(category, product_id, manifest, max_dimension=MAX_DIMENSION, quality=QUALITY):
+    source_dir = os.path.join(SOURCE_DIR, category, product_id)
+    target_dir = os.path.join(OUTPUT_DIR, category, product_id)
+    settings = settings_key(max_dimension, quality)
+    filenames = [filename for filename in sorted(os.listdir(source_dir))
+                 if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS]
+    shared = shared_stems(filenames)
+    jobs = []
+    for filename in filenames:
+        target = os.path.join(target_dir, output_name(filename, shared))
+        entry = manifest.get(target) or {}
+        known_hash = entry.get('source_hash') if entry.get('settings') == settings else None
+        jobs.append((os.path.join(source_dir, filename), target, known_hash, max_dimension, quality))
+    return jobs
+
+def remove_stale_outputs(category, product_id, targets, manifest):
+    # Outputs whose source photo was deleted would otherwise still be synced to S3
+    target_dir = os.path.join(OUTPUT_DIR, category, product_id)
+    if not os.path.isdir(target_dir):
+        return []
+    removed = []
+    for filename in os.listdir(target_dir):
+        path = os.path.join(target_dir, filename)
+        if path not in targets and os.path.isfile(path):
+            os.remove(path)
+            manifest.pop(path, None)
+            removed.append(path)
+    return removed
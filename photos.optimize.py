@@ -0,0 +1,95 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from product_ids import parse_product_ids
+import photo_optimizer
+from photo_optimizer import (
+    SOURCE_DIR, OUTPUT_DIR, MAX_DIMENSION, QUALITY, settings_key, optimize_job,
+    load_manifest, save_manifest, product_jobs, remove_stale_outputs
+)
+
+def format_size(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB" if num_bytes >= 1024 * 1024 else f"{num_bytes / 1024:.0f} KB"
+
+def optimize_photos(category, product_ids, workers=None, max_dimension=MAX_DIMENSION, quality=QUALITY):
+    manifest = load_manifest()
+    settings = settings_key(max_dimension, quality)
+    jobs = []
+    for product_id in product_ids:
+        photo_jobs = product_jobs(category, product_id, manifest, max_dimension, quality)
+        for path in remove_stale_outputs(category, product_id, {job[1] for job in photo_jobs}, manifest):
+            print(f"🗑️  Removed {path} (source photo gone)")
+        jobs.extend(photo_jobs)
+
+    counts = {'optimized': 0, 'cached': 0, 'failed': 0}
+    failed_sources = []
+    source_bytes = target_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for source, target, digest, status in executor.map(optimize_job, jobs, chunksize=4):
+            if status.startswith('failed'):
+                counts['failed'] += 1
+                failed_sources.append(source)
+                print(f"❌ {source}: {status}")
+                continue
+            counts[status] += 1
+            manifest[target] = {'source_hash': digest, 'settings': settings}
+            if status == 'optimized':
+                source_size, target_size = os.path.getsize(source), os.path.getsize(target)
+                source_bytes += source_size
+                target_bytes += target_size
+                print(f"✅ {target}: {format_size(source_size)} → {format_size(target_size)}")
+    save_manifest(manifest)
+
+    print(f"\n🧾 {counts['optimized']} optimized, {counts['cached']} unchanged, {counts['failed']} failed")
+    if counts['optimized']:
+        print(f"   {format_size(source_bytes)} → {format_size(target_bytes)}")
+    return counts, failed_sources
+
+def parse_options(args):
+    options = {'id_spec': 'all', 'workers': None, 'max_dimension': MAX_DIMENSION, 'quality': QUALITY}
+    args = list(args)
+    if args and not args[0].startswith('--'):
+        options['id_spec'] = args.pop(0)
+    while args:
+        arg = args.pop(0)
+        if arg in ('--workers', '--max-size', '--quality') and args and args[0].isdigit() and int(args[0]) > 0:
+            key = {'--workers': 'workers', '--max-size': 'max_dimension', '--quality': 'quality'}[arg]
+            options[key] = int(args.pop(0))
+        else:
+            return None
+    if options['quality'] > 95:
+        return None
+    return options
+
+def main():
+    options = parse_options(sys.argv[2:])
+    if len(sys.argv) < 2 or options is None:
+        script_name = os.path.basename(__file__)
+        print(f"Usage: python {script_name} <category> [product_ids|first-last|all|@ids.txt] [--workers N] [--max-size {MAX_DIMENSION}] [--quality {QUALITY}]")
+        sys.exit(1)
+
+    if photo_optimizer.Image is None:
+        sys.exit("❌ Pillow is required for photo optimization: pip install Pillow")
+
+    category = sys.argv[1]
+    category_dir = os.path.join(SOURCE_DIR, category)
+    if not os.path.isdir(category_dir):
+        sys.exit(f"❌ Photo folder not found: {category_dir}")
+
+    available = sorted(name for name in os.listdir(category_dir) if os.path.isdir(os.path.join(category_dir, name)))
+    try:
+        product_ids = parse_product_ids(options['id_spec'], available=available)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    missing = [product_id for product_id in product_ids if product_id not in available]
+    for product_id in missing:
+        print(f"⚠️  No photo folder for product {product_id}")
+    product_ids = [product_id for product_id in product_ids if product_id in available]
+
+    counts, _ = optimize_photos(category, product_ids, options['workers'], options['max_dimension'], options['quality'])
+    print(f"Upload with: ./s3.upload.sh {category} {OUTPUT_DIR}")
+    if counts['failed']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
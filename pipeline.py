@@ -0,0 +1,341 @@
+import hashlib
+import importlib.util
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import requests
+from ebay_config import ENV
+from eps_cache import eps_csv_name
+from local_cache import cache_path, file_sha256, load_json, save_json
+from product_ids import parse_product_ids
+from sheet_cache import read_sheet
+
+# Runs the README's listing steps for many products in one command. Each stage
+# reduces a product's inputs to a content hash; a stage is skipped for products
+# whose hash matches the one recorded when it last succeeded there, and the
+# record (.cache/pipeline.<env>.json) is saved after every stage, so a rerun
+# after a crash resumes at the first stage that had not finished.
+#
+#   pricing ─▶ listings ───────────────────────────┐
+#   [photos] ─▶ s3 (upload + urls) ─▶ eps ─────────┴─▶ stock (+ publish)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKERS = 4
+GLOBAL = '*'
+
+@lru_cache(maxsize=None)
+def load_script(name):
+    # The stage scripts have dotted file names, so they are loaded by path
+    spec = importlib.util.spec_from_file_location(name.replace('.', '_'), os.path.join(SCRIPT_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+def file_digest(path):
+    if not os.path.exists(path):
+        raise ValueError(f"missing {path}")
+    return file_sha256(path)
+
+def folder_signature(path):
+    # Photo folders are large; name, size and mtime stand in for their content
+    if not os.path.isdir(path):
+        raise ValueError(f"missing {path}")
+    entries = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for filename in sorted(f for f in files if not f.startswith('.')):
+            stat = os.stat(os.path.join(root, filename))
+            entries.append((os.path.relpath(os.path.join(root, filename), path), stat.st_size, stat.st_mtime_ns))
+    if not entries:
+        raise ValueError(f"no photos in {path}")
+    return digest(*entries)
+
+def state_path():
+    return cache_path(f"pipeline.{ENV}.json")
+
+def load_state():
+    return load_json(state_path())
+
+def save_state(state):
+    save_json(state_path(), state, indent=1, sort_keys=True)
+
+class Stage:
+    def __init__(self, name, after, inputs, run, output=None, per_product=True):
+        self.name = name
+        self.after = after
+        self.inputs = inputs      # (run, product_id) -> hash; ValueError when an input is missing
+        self.run = run            # (run, product_ids) -> {product_id: error message}
+        self.output = output      # (run, product_id) -> path that must still exist to skip
+        self.per_product = per_product
+
+class PipelineRun:
+    def __init__(self, input_xlsx, priced_xlsx, product_ids, options):
+        self.input_xlsx = input_xlsx
+        self.priced_xlsx = priced_xlsx
+        self.product_ids = product_ids
+        self.options = options
+        self.stock = load_script('stock')
+        self.category = self.stock.CATEGORY
+        self.photo_dir = 'photos.optimized' if options['optimize'] else 'photos'
+        self.priced_rows = None
+
+    def priced_sheet(self):
+        return read_sheet(self.priced_xlsx, dtype={'id': str})
+
+    def row_digest(self, product_id):
+        if self.priced_rows is None:
+            if not os.path.exists(self.priced_xlsx):
+                raise ValueError(f"{self.priced_xlsx} not found")
+            df = self.priced_sheet()
+            self.priced_rows = {pid: digest(*row) for pid, row in zip(df['id'], df.astype(str).itertuples(index=False))}
+        if product_id not in self.priced_rows:
+            raise ValueError(f"not in {self.priced_xlsx}")
+        return self.priced_rows[product_id]
+
+    def urls_file(self, product_id):
+        return f"s3.{self.category}.{product_id}.urls.txt"
+
+# --- pricing -----------------------------------------------------------------
+
+def pricing_inputs(run, _):
+    return digest(file_digest(run.input_xlsx), file_digest(run.options['rules_path']), run.priced_xlsx)
+
+def run_pricing(run, _):
+    pricing = load_script('diecast.pricing')
+    rules_path = run.options['rules_path']
+    try:
+        rules = pricing.load_rules(rules_path)
+    except (OSError, ValueError, KeyError) as e:
+        return {GLOBAL: f"could not load pricing rules {rules_path}: {e}"}
+    pricing.price_workbook(run.input_xlsx, run.priced_xlsx, rules, file_sha256(rules_path), incremental=True)
+    run.priced_rows = None
+    return {}
+
+# --- listings ----------------------------------------------------------------
+
+def listing_inputs(run, product_id):
+    return digest(file_digest(run.options['template_path']), run.row_digest(product_id))
+
+def run_listings(run, product_ids):
+    listings = load_script('diecast.listings')
+    df = run.priced_sheet()
+    listings.render_rows(listings.load_template(run.options['template_path']), df[df['id'].isin(product_ids)], 'diecast.listing.')
+    return {}
+
+# --- photos / s3 / eps -------------------------------------------------------
+
+def photo_inputs(run, product_id):
+    return digest(folder_signature(os.path.join('photos', run.category, product_id)), run.options['optimize'])
+
+def run_photos(run, product_ids):
+    optimizer = load_script('photos.optimize')
+    _, failed_sources = optimizer.optimize_photos(run.category, product_ids, run.options['workers'])
+    errors = {}
+    for source in failed_sources:
+        errors[os.path.basename(os.path.dirname(source))] = f"could not optimize {source}"
+    return errors
+
+def s3_inputs(run, product_id):
+    return digest(folder_signature(os.path.join(run.photo_dir, run.category, product_id)))
+
+def run_s3(run, product_ids):
+    from s3_sync import S3Sync
+    sync = S3Sync()
+    results = sync.upload(run.photo_dir, run.category, product_ids, run.options['workers'])
+    print(f"☁️  {len(results['uploaded'])} photo(s) uploaded, {results['skipped']} unchanged")
+    errors = {}
+    for path, error in results['failed']:
+        errors[os.path.basename(os.path.dirname(path))] = f"S3 upload of {path} failed: {error}"
+    keys = sync.product_keys(run.category)
+    ok_ids = [product_id for product_id in product_ids if product_id not in errors]
+    for product_id, (_, count) in sync.write_url_files(run.category, ok_ids, keys).items():
+        if not count:
+            errors[product_id] = f"no photos under s3://{sync.bucket}/{run.category}/{product_id}/"
+    return errors
+
+def eps_inputs(run, product_id):
+    # The photo folder too: re-optimized photos keep their S3 URLs
+    return digest(file_digest(run.urls_file(product_id)), s3_inputs(run, product_id), ENV)
+
+def upload_product_photos(run, product_id):
+    eps = load_script('eps.upload')
+    with open(run.urls_file(product_id)) as f:
+        urls = [line.strip() for line in f if line.strip()]
+    rows = eps.write_eps_csv(urls, eps_csv_name(run.category, product_id, ENV))
+    failed = [status for _, ebay_url, status in rows if not ebay_url]
+    return f"{len(failed)} EPS upload(s) failed: {failed[0]}" if failed else None
+
+def run_eps(run, product_ids):
+    # Products upload concurrently; each also uploads its photos concurrently
+    load_script('eps.upload')
+    with ThreadPoolExecutor(max_workers=run.options['workers']) as executor:
+        errors = dict(zip(product_ids, executor.map(lambda product_id: upload_product_photos(run, product_id), product_ids)))
+    for product_id in product_ids:
+        print(f"  {'❌' if errors[product_id] else '✅'} EPS {product_id}: {errors[product_id] or 'ok'}")
+    return {product_id: error for product_id, error in errors.items() if error}
+
+# --- stock -------------------------------------------------------------------
+
+def eps_urls_digest(run, product_id):
+    # Only the picture URLs reach the listing, not the CSV's upload status column
+    path = eps_csv_name(run.category, product_id, ENV)
+    if not os.path.exists(path):
+        raise ValueError(f"missing {path}")
+    return digest(*run.stock.read_image_urls(path))
+
+def stock_inputs(run, product_id):
+    return digest(
+        run.row_digest(product_id),
+        file_digest(run.stock.description_path(product_id)),
+        eps_urls_digest(run, product_id),
+        ENV,
+        run.options['publish']
+    )
+
+def run_stock(run, product_ids):
+    try:
+        results = run.stock.run_batch(run.priced_xlsx, ','.join(product_ids), publish=run.options['publish'])
+    except (ValueError, requests.exceptions.RequestException) as e:
+        return {product_id: str(e) for product_id in product_ids}
+    # Sold cars (orders.sync.py) are skipped on purpose, not failed
+    return {
+        product_id: results.get(f"DIECAST-{product_id}", 'no result')
+        for product_id in product_ids
+        if results.get(f"DIECAST-{product_id}") != 'ok'
+        and not results.get(f"DIECAST-{product_id}", '').startswith('skipped (sold')
+    }
+
+def build_stages(options):
+    stages = [
+        Stage('pricing', [], pricing_inputs, run_pricing, lambda run, _: run.priced_xlsx, per_product=False),
+        Stage('listings', ['pricing'], listing_inputs, run_listings, lambda run, pid: run.stock.description_path(pid)),
+    ]
+    if options['optimize']:
+        stages.append(Stage('photos', [], photo_inputs, run_photos,
+                            lambda run, pid: os.path.join(run.photo_dir, run.category, pid)))
+    stages += [
+        Stage('s3', ['photos'] if options['optimize'] else [], s3_inputs, run_s3, lambda run, pid: run.urls_file(pid)),
+        Stage('eps', ['s3'], eps_inputs, run_eps, lambda run, pid: eps_csv_name(run.category, pid, ENV)),
+        Stage('stock', ['listings', 'eps'], stock_inputs, run_stock),
+    ]
+    return stages
+
+def upstream(stages):
+    # Every stage each stage depends on, directly or transitively
+    requires = {}
+    for stage in stages:
+        requires[stage.name] = set(stage.after).union(*(requires[name] for name in stage.after))
+    return requires
+
+def run_pipeline(run, stages, force=False):
+    state = load_state()
+    requires = upstream(stages)
+    failures = {}  # product_id -> {stage: message}
+
+    for stage in stages:
+        if any(name in failures.get(GLOBAL, {}) for name in requires[stage.name]):
+            print(f"\n⏹️  {stage.name}: skipped, an earlier stage failed")
+            continue
+        done = state.setdefault(stage.name, {})
+        products = run.product_ids if stage.per_product else [GLOBAL]
+        hashes = {}
+        pending = []
+        for product_id in products:
+            if requires[stage.name] & set(failures.get(product_id, {})):
+                continue
+            try:
+                hashes[product_id] = stage.inputs(run, product_id)
+            except ValueError as e:
+                failures.setdefault(product_id, {})[stage.name] = str(e)
+                continue
+            output = stage.output(run, product_id) if stage.output else None
+            if force or done.get(product_id) != hashes[product_id] or (output and not os.path.exists(output)):
+                pending.append(product_id)
+
+        print(f"\n▶️  {stage.name}: {len(pending)} to run, {len(hashes) - len(pending)} unchanged")
+        if not pending:
+            continue
+        errors = stage.run(run, pending)
+        for product_id in pending:
+            if errors.get(product_id):
+                failures.setdefault(product_id, {})[stage.name] = errors[product_id]
+                done.pop(product_id, None)
+            else:
+                done[product_id] = hashes[product_id]
+        save_state(state)
+    return failures
+
+def print_pipeline_summary(product_ids, failures):
+    if GLOBAL in failures:
+        for stage_name, message in failures[GLOBAL].items():
+            print(f"\n❌ {stage_name} failed: {message}")
+    ready = [product_id for product_id in product_ids if product_id not in failures]
+    print(f"\n🧾 Pipeline summary: {len(ready)}/{len(product_ids)} product(s) through every stage")
+    for product_id in product_ids:
+        if product_id in failures:
+            for stage_name, message in failures[product_id].items():
+                print(f"  ❌ {product_id}: {stage_name} failed ({message})")
+        else:
+            print(f"  ✅ {product_id}: ok")
+
+def parse_options(args):
+    options = {
+        'template_path': 'template.diecast.html',
+        'rules_path': None,
+        'optimize': False,
+        'publish': False,
+        'force': False,
+        'workers': DEFAULT_WORKERS
+    }
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == '--template' and args:
+            options['template_path'] = args.pop(0)
+        elif arg == '--rules' and args:
+            options['rules_path'] = args.pop(0)
+        elif arg == '--workers' and args and args[0].isdigit() and int(args[0]) > 0:
+            options['workers'] = int(args.pop(0))
+        elif arg in ('--optimize', '--publish', '--force'):
+            options[arg[2:]] = True
+        else:
+            return None
+    return options
+
+def main():
+    options = parse_options(sys.argv[4:])
+    if len(sys.argv) < 4 or options is None:
+        script = os.path.basename(__file__)
+        print(f"Usage: python {script} <input.xlsx> <priced.xlsx> <product_ids|first-last|all|@ids.txt> "
+              "[--template template.diecast.html] [--rules rules.json] [--optimize] [--publish] [--workers N] [--force]")
+        sys.exit(1)
+
+    input_xlsx, priced_xlsx, id_spec = sys.argv[1:4]
+    for path in [input_xlsx, options['template_path']]:
+        if not os.path.exists(path):
+            sys.exit(f"❌ File not found: {path}")
+    options['rules_path'] = options['rules_path'] or load_script('diecast.pricing').DEFAULT_RULES_PATH
+
+    try:
+        product_ids = parse_product_ids(id_spec, available=read_sheet(input_xlsx, dtype={'id': str})['id'].dropna())
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    if not product_ids:
+        sys.exit("❌ No product ids selected.")
+
+    run = PipelineRun(input_xlsx, priced_xlsx, product_ids, options)
+    failures = run_pipeline(run, build_stages(options), options['force'])
+    print_pipeline_summary(product_ids, failures)
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import ebay_rest
+from local_cache import cache_path, load_json, save_json
+
+# Business policy name → id lookups shared by stock.py and seller.policies.py.
+# All three policy types are listed concurrently and the name → id maps are
+# kept on disk per environment, so pushing a listing needs no policy calls.
+# seller.policies.py create/update/delete clear the cache.
+
+POLICY_TYPES = ('fulfillment_policy', 'payment_policy', 'return_policy')
+POLICY_TTL = 24 * 3600
+
+def id_field(policy_type):
+    return f"{policy_type.split('_')[0]}PolicyId"
+
+def list_field(policy_type):
+    return f"{policy_type.split('_')[0]}Policies"
+
+def policy_cache_path(env):
+    return cache_path(f"policies.{env}.json")
+
+def load_cached_policies(env):
+    data = load_json(policy_cache_path(env))
+    if data.get('fetched_at', 0) + POLICY_TTL < time.time():
+        return None
+    return data.get('policies')
+
+def save_cached_policies(env, policies):
+    save_json(policy_cache_path(env), {'fetched_at': time.time(), 'policies': policies})
+
+def invalidate_policy_cache(env):
+    try:
+        os.remove(policy_cache_path(env))
+    except FileNotFoundError:
+        pass
+
+def fetch_policy_type(base_url, headers, policy_type):
+    r = ebay_rest.get(f"{base_url}/sell/account/v1/{policy_type}?marketplace_id=EBAY_US", headers=headers)
+    if r.status_code != 200:
+        raise ValueError(f"Failed to fetch {policy_type.replace('_', ' ')}s: {r.status_code} - {r.text}")
+    try:
+        policies = r.json().get(list_field(policy_type), [])
+    except ValueError:
+        policies = []
+    return {policy['name'].lower(): policy[id_field(policy_type)] for policy in policies if policy.get('name')}
+
+def fetch_policies(base_url, headers):
+    with ThreadPoolExecutor(max_workers=len(POLICY_TYPES)) as pool:
+        maps = pool.map(lambda policy_type: fetch_policy_type(base_url, headers, policy_type), POLICY_TYPES)
+        return dict(zip(POLICY_TYPES, maps))
+
+def resolve_policy_ids(env, base_url, get_headers, names):
+    # names: {'fulfillment_policy': 'standard shipping', ...} → {'fulfillment_policy': id, ...}
+    # get_headers is only called when the cache has to be (re)filled.
+    policies = load_cached_policies(env)
+    # A name missing from the cache may be a policy created since it was written
+    if policies is None or any(name.lower() not in policies.get(t, {}) for t, name in names.items()):
+        policies = fetch_policies(base_url, get_headers())
+        save_cached_policies(env, policies)
+
+    ids = {}
+    for policy_type, name in names.items():
+        policy_id = policies.get(policy_type, {}).get(name.lower())
+        if policy_id is None:
+            raise ValueError(f"{policy_type.split('_')[0].capitalize()} policy named '{name}' not found.")
+        ids[policy_type] = policy_id
+    return ids
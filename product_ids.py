@@ -0,0 +1,43 @@
+import os
+
+# Parses product id selections shared by the batch commands, e.g.
+#   "007"          -> ['007']
+#   "001,004,010"  -> ['001', '004', '010']
+#   "001-005"      -> ['001', '002', '003', '004', '005']
+#   "all"          -> every id in `available` (the spreadsheet ids)
+#   "@ids.txt"     -> ids listed one per line (or comma separated) in a file
+
+def expand_range(part):
+    start, end = (p.strip() for p in part.split('-', 1))
+    if not (start.isdigit() and end.isdigit()):
+        raise ValueError(f"Invalid product id range: {part}")
+    width = max(len(start), len(end))
+    lo, hi = int(start), int(end)
+    if lo > hi:
+        raise ValueError(f"Invalid product id range (start > end): {part}")
+    return [str(i).zfill(width) for i in range(lo, hi + 1)]
+
+def parse_product_ids(spec, available=None):
+    spec = spec.strip()
+    if spec.lower() == 'all':
+        if available is None:
+            raise ValueError("'all' requires a spreadsheet to read product ids from.")
+        return list(dict.fromkeys(str(i) for i in available))
+
+    if spec.startswith('@'):
+        path = spec[1:]
+        if not os.path.exists(path):
+            raise ValueError(f"Product id file not found: {path}")
+        with open(path, encoding='utf-8') as f:
+            spec = ','.join(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    ids = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            ids.extend(expand_range(part))
+        else:
+            ids.append(part)
+    return list(dict.fromkeys(ids))
@@ -1,5 +1,5 @@
 import sys
-import requests
+import ebay_rest
 import base64
 from urllib.parse import unquote, urlencode
 from ebay_config import ENV, APP_ID, CERT_ID, RUNAME
@@ -39,7 +39,7 @@ def process_code(auth_code):
         "redirect_uri": RUNAME
     }
 
-    response = requests.post(url, headers=headers, data=data)
+    response = ebay_rest.post(url, headers=headers, data=data)
 
     if response.status_code == 200:
         token_data = response.json()
@@ -0,0 +1,69 @@
+import os
+import sys
+from product_ids import parse_product_ids
+from s3_sync import S3Sync, DEFAULT_WORKERS, product_folders
+
+def select_ids(id_spec, available):
+    try:
+        return parse_product_ids(id_spec, available=available)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+def upload(category, id_spec, source_dir, workers):
+    product_ids = select_ids(id_spec, product_folders(source_dir, category))
+    if not product_ids:
+        sys.exit(f"❌ No product folders under {os.path.join(source_dir, category)}")
+
+    sync = S3Sync()
+    results = sync.upload(source_dir, category, product_ids, workers)
+    for key in results['uploaded']:
+        print(f"✅ Uploaded s3://{sync.bucket}/{key}")
+    for path, error in results['failed']:
+        print(f"❌ {path}: {error}")
+    print(f"\n🧾 {len(results['uploaded'])} uploaded, {results['skipped']} unchanged, {len(results['failed'])} failed")
+    if results['failed']:
+        sys.exit(1)
+
+def write_urls(category, id_spec, refresh):
+    sync = S3Sync()
+    keys = sync.product_keys(category, refresh)
+    product_ids = select_ids(id_spec, sorted(keys))
+    for product_id, (output_file, count) in sync.write_url_files(category, product_ids, keys).items():
+        if count:
+            print(f"✅ {output_file}: {count} URL(s)")
+        else:
+            print(f"⚠️  {output_file}: no photos under s3://{sync.bucket}/{category}/{product_id}/")
+
+def parse_options(args):
+    options = {'id_spec': 'all', 'source_dir': 'photos', 'workers': DEFAULT_WORKERS, 'refresh': False}
+    args = list(args)
+    if args and not args[0].startswith('--'):
+        options['id_spec'] = args.pop(0)
+    while args:
+        arg = args.pop(0)
+        if arg == '--source' and args:
+            options['source_dir'] = args.pop(0)
+        elif arg == '--workers' and args and args[0].isdigit() and int(args[0]) > 0:
+            options['workers'] = int(args.pop(0))
+        elif arg == '--refresh':
+            options['refresh'] = True
+        else:
+            return None
+    return options
+
+def main():
+    options = parse_options(sys.argv[3:])
+    if len(sys.argv) < 3 or sys.argv[1] not in ('upload', 'urls') or options is None:
+        script = os.path.basename(__file__)
+        print(f"Usage: python {script} upload <category> [product_ids|first-last|all|@ids.txt] [--source photos|photos.optimized] [--workers N]")
+        print(f"       python {script} urls <category> [product_ids|first-last|all|@ids.txt] [--refresh]")
+        sys.exit(1)
+
+    action, category = sys.argv[1], sys.argv[2]
+    if action == 'upload':
+        upload(category, options['id_spec'], options['source_dir'], options['workers'])
+    else:
+        write_urls(category, options['id_spec'], options['refresh'])
+
+if __name__ == '__main__':
+    main()
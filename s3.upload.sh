@@ -5,13 +5,15 @@ BUCKET_NAME="ebay.photos"
 
 # Check if category is provided
 if [ -z "$1" ]; then
-  echo "Usage: $0 <category>"
+  echo "Usage: $0 <category> [source_dir]"
   exit 1
 fi
 
 CATEGORY="$1"
+# photos (originals) by default; photos.optimized after running photos.optimize.py
+SOURCE_DIR="${2:-photos}"
 
-aws s3 sync "./photos/${CATEGORY}" "s3://${BUCKET_NAME}/${CATEGORY}/" \
+aws s3 sync "./${SOURCE_DIR}/${CATEGORY}" "s3://${BUCKET_NAME}/${CATEGORY}/" \
   --exact-timestamps \
   --exclude ".DS_Store" \
   --exclude "*/.DS_Store" #--dryrun
\ No newline at end of file
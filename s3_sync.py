@@ -0,0 +1,165 @@
+import hashlib
+import mimetypes
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from local_cache import cache_path, load_json, save_json
+
+# Python replacement for s3.upload.sh / s3.get.urls.sh. One paginated listing
+# of the category prefix is cached in .cache/s3.<bucket>.json together with
+# the ETag of every local photo (recomputed only when its size or mtime
+# changes), so a sync uploads just the photos whose content differs and the
+# URL files for any number of products come from a single listing.
+# Set S3_ENDPOINT_URL to run against MinIO or a moto server.
+
+BUCKET_NAME = 'ebay.photos'
+REGION = 'us-east-1'
+ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')
+DEFAULT_WORKERS = 8
+LIST_TTL = 15 * 60
+
+# Multipart threshold and part size equal the AWS CLI defaults, so ETags of
+# objects uploaded either way can be compared with the locally computed ones
+PART_SIZE = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=PART_SIZE,
+    multipart_chunksize=PART_SIZE,
+    max_concurrency=4,
+    use_threads=True
+)
+
+def get_s3_client():
+    return boto3.client(
+        's3',
+        region_name=REGION,
+        endpoint_url=ENDPOINT_URL,
+        config=Config(max_pool_connections=DEFAULT_WORKERS * TRANSFER_CONFIG.max_concurrency)
+    )
+
+def s3_etag(path):
+    # MD5 for single-part uploads; MD5 of the part MD5s plus "-<parts>" for multipart
+    digests = []
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(PART_SIZE), b''):
+            digests.append(hashlib.md5(block))
+    if os.path.getsize(path) < PART_SIZE:
+        return digests[0].hexdigest() if digests else hashlib.md5(b'').hexdigest()
+    combined = hashlib.md5(b''.join(digest.digest() for digest in digests))
+    return f"{combined.hexdigest()}-{len(digests)}"
+
+def product_folders(source_dir, category):
+    category_dir = os.path.join(source_dir, category)
+    if not os.path.isdir(category_dir):
+        return []
+    return sorted(name for name in os.listdir(category_dir) if os.path.isdir(os.path.join(category_dir, name)))
+
+def local_files(source_dir, category, product_ids):
+    # (path, key) pairs; keys are <category>/<product_id>/<file> like aws s3 sync
+    for product_id in product_ids:
+        product_dir = os.path.join(source_dir, category, product_id)
+        for root, dirs, files in os.walk(product_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for filename in sorted(files):
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(root, filename)
+                key = '/'.join([category] + os.path.relpath(path, os.path.join(source_dir, category)).split(os.sep))
+                yield path, key
+
+class S3Sync:
+    def __init__(self, bucket=BUCKET_NAME, client=None, state_path=None):
+        self.bucket = bucket
+        self.client = client or get_s3_client()
+        self.state_path = state_path or cache_path(f"s3.{bucket}.json")
+        self.state = load_json(self.state_path)
+        self.state.setdefault('listings', {})
+        self.state.setdefault('files', {})
+
+    def save(self):
+        save_json(self.state_path, self.state)
+
+    def list_prefix(self, prefix, refresh=False):
+        # {key: etag} for every object under prefix
+        entry = self.state['listings'].get(prefix)
+        if entry and not refresh and entry['listed_at'] + LIST_TTL > time.time():
+            return entry['objects']
+        objects = {}
+        for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                objects[obj['Key']] = obj['ETag'].strip('"')
+        self.state['listings'][prefix] = {'listed_at': time.time(), 'objects': objects}
+        return objects
+
+    def local_etag(self, path):
+        stat = os.stat(path)
+        entry = self.state['files'].get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['etag']
+        etag = s3_etag(path)
+        self.state['files'][path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'etag': etag}
+        return etag
+
+    def upload_file(self, path, key):
+        extra_args = {}
+        content_type = mimetypes.guess_type(path)[0]
+        if content_type:
+            extra_args['ContentType'] = content_type
+        try:
+            self.client.upload_file(path, self.bucket, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
+        except (BotoCoreError, ClientError, OSError) as e:
+            return str(e)
+        return None
+
+    def upload(self, source_dir, category, product_ids, workers=DEFAULT_WORKERS):
+        # Always lists afresh: a stale listing could hide a deleted object
+        remote = self.list_prefix(f"{category}/", refresh=True)
+        pending = []
+        skipped = 0
+        for path, key in local_files(source_dir, category, product_ids):
+            etag = self.local_etag(path)
+            if remote.get(key) == etag:
+                skipped += 1
+            else:
+                pending.append((path, key, etag))
+
+        results = {'uploaded': [], 'skipped': skipped, 'failed': []}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            errors = executor.map(lambda job: self.upload_file(job[0], job[1]), pending)
+            for (path, key, etag), error in zip(pending, errors):
+                if error:
+                    results['failed'].append((path, error))
+                else:
+                    remote[key] = etag
+                    results['uploaded'].append(key)
+        self.save()
+        return results
+
+    def object_url(self, key):
+        endpoint = self.client.meta.endpoint_url.rstrip('/')
+        if 'amazonaws.com' in endpoint:
+            return f"https://s3.{REGION}.amazonaws.com/{self.bucket}/{key}"
+        return f"{endpoint}/{self.bucket}/{key}"
+
+    def product_keys(self, category, refresh=False):
+        keys = defaultdict(list)
+        for key in sorted(self.list_prefix(f"{category}/", refresh)):
+            parts = key.split('/')
+            if len(parts) >= 3 and parts[-1]:
+                keys[parts[1]].append(key)
+        self.save()
+        return keys
+
+    def write_url_files(self, category, product_ids, keys):
+        # Same file name and line format as s3.get.urls.sh
+        written = {}
+        for product_id in product_ids:
+            output_file = f"s3.{category}.{product_id}.urls.txt"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(''.join(f"{self.object_url(key)}\n" for key in keys.get(product_id, [])))
+            written[product_id] = (output_file, len(keys.get(product_id, [])))
+        return written
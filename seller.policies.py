@@ -1,15 +1,13 @@
 import sys
 import os
-import requests
-from ebay_config import ENV, get_oauth_token_from_refresh_token
+import ebay_rest
+from policy_cache import resolve_policy_ids, invalidate_policy_cache, id_field, list_field
+from ebay_config import ENV
+from token_cache import auth_headers
 
-OAUTH_TOKEN = get_oauth_token_from_refresh_token(['https://api.ebay.com/oauth/api_scope/sell.account'])
+SCOPES = ['https://api.ebay.com/oauth/api_scope/sell.account']
 
 BASE_URL = 'https://api.sandbox.ebay.com' if ENV == 'sandbox' else 'https://api.ebay.com'
-HEADERS = {
-    'Authorization': f"Bearer {OAUTH_TOKEN}",
-    'Content-Type': 'application/json'
-}
 
 POLICY_NAMES = {
     'fulfillment_policy': 'standard shipping',
@@ -36,7 +34,7 @@ def handle_response(r, success_msg=None, error_prefix=None):
 
 def enable_business_policies():
     payload = {'programType': 'SELLING_POLICY_MANAGEMENT'}
-    r = requests.post(f"{BASE_URL}/sell/account/v1/program/opt_in", headers=HEADERS, json=payload)
+    r = ebay_rest.post(f"{BASE_URL}/sell/account/v1/program/opt_in", headers=auth_headers(SCOPES), json=payload)
     if r.status_code == 200:
         print('✅ Successfully opted in.')
     elif r.status_code == 409:
@@ -47,62 +45,52 @@ def enable_business_policies():
 
 def disable_business_policies():
     payload = {'programType': 'SELLING_POLICY_MANAGEMENT'}
-    r = requests.post(f"{BASE_URL}/sell/account/v1/program/opt_out", headers=HEADERS, json=payload)
+    r = ebay_rest.post(f"{BASE_URL}/sell/account/v1/program/opt_out", headers=auth_headers(SCOPES), json=payload)
     if r.status_code == 200:
         print('✅ Successfully opted out.')
     else:
         handle_response(r, error_prefix='Disable Business Policies')
 
 def check_opted_in_programs():
-    r = requests.get(f"{BASE_URL}/sell/account/v1/program/get_opted_in_programs", headers=HEADERS)
+    r = ebay_rest.get(f"{BASE_URL}/sell/account/v1/program/get_opted_in_programs", headers=auth_headers(SCOPES))
     data = handle_response(r, success_msg='Opted-In Programs:')
     if data:
         print(data)
 
 def delete_policies():
-    id_field_map = {
-        'fulfillment_policy': 'fulfillmentPolicyId',
-        'payment_policy': 'paymentPolicyId',
-        'return_policy': 'returnPolicyId',
-    }
-
-    response_key_map = {
-        'fulfillment_policy': 'fulfillmentPolicies',
-        'payment_policy': 'paymentPolicies',
-        'return_policy': 'returnPolicies',
-    }
-
-    for policy_type in id_field_map:
-        r = requests.get(f"{BASE_URL}/sell/account/v1/{policy_type}?marketplace_id=EBAY_US", headers=HEADERS)
-        policies = r.json().get(response_key_map[policy_type], [])
+    for policy_type in POLICY_NAMES:
+        r = ebay_rest.get(f"{BASE_URL}/sell/account/v1/{policy_type}?marketplace_id=EBAY_US", headers=auth_headers(SCOPES))
+        policies = r.json().get(list_field(policy_type), [])
         for policy in policies:
             if policy['name'].lower() != POLICY_NAMES[policy_type].lower(): continue
-            policy_id = policy.get(id_field_map[policy_type])
+            policy_id = policy.get(id_field(policy_type))
             if policy_id:
                 del_url = f"{BASE_URL}/sell/account/v1/{policy_type}/{policy_id}"
-                del_resp = requests.delete(del_url, headers=HEADERS)
+                del_resp = ebay_rest.delete(del_url, headers=auth_headers(SCOPES))
                 handle_response(del_resp, success_msg=f"Deleted {policy_type} {policy_id}", error_prefix=f"Delete {policy_type}")
+    invalidate_policy_cache(ENV)
 
 def create_policy(policy_type, payload):
     url = f"{BASE_URL}/sell/account/v1/{policy_type}"
-    r = requests.post(url, headers=HEADERS, json=payload)
+    r = ebay_rest.post(url, headers=auth_headers(SCOPES), json=payload)
     if r.status_code in {200, 201}:
-        id_key_map = {
-            'fulfillment_policy': 'fulfillmentPolicyId',
-            'payment_policy': 'paymentPolicyId',
-            'return_policy': 'returnPolicyId'
-        }
-        policy_id = r.json().get(id_key_map[policy_type], 'N/A')
+        invalidate_policy_cache(ENV)
+        policy_id = r.json().get(id_field(policy_type), 'N/A')
         print(f"✅ Created {policy_type}: {policy_id}")
     else:
         handle_response(r, error_prefix=f"Create {policy_type}")
 
 def update_policy(policy_type, payload):
+    # Resolve against the live policies: a cached id may belong to a policy deleted since
+    invalidate_policy_cache(ENV)
     policy_id = get_policy_id_by_name(policy_type, POLICY_NAMES[policy_type])
+    if policy_id is None:
+        return
 
     url = f"{BASE_URL}/sell/account/v1/{policy_type}/{policy_id}"
-    r = requests.put(url, headers=HEADERS, json=payload)
+    r = ebay_rest.put(url, headers=auth_headers(SCOPES), json=payload)
     if r.status_code in {200, 201}:
+        invalidate_policy_cache(ENV)
         print(f"✅ Updated {policy_type}: {policy_id}")
     elif r.status_code == 400:
         print(f"⚠️  Updated {policy_type}: Business Profile information in the request is the same as in the system.")
@@ -154,45 +142,19 @@ def write_policies(upsert):
 def read_policies():
     for policy_type in ['fulfillment_policy', 'payment_policy', 'return_policy']:
         url = f"{BASE_URL}/sell/account/v1/{policy_type}?marketplace_id=EBAY_US"
-        r = requests.get(url, headers=HEADERS)
+        r = ebay_rest.get(url, headers=auth_headers(SCOPES))
         print(f"\n📘 {policy_type.replace('_', ' ').title()}(s):")
         data = handle_response(r, error_prefix=f"Read {policy_type}")
         if data:
             print(data)
 
 def get_policy_id_by_name(policy_type, target_name):
-    endpoint = f"{BASE_URL}/sell/account/v1/{policy_type}?marketplace_id=EBAY_US"
-    r = requests.get(endpoint, headers=HEADERS)
-    if r.status_code != 200:
-        print(f"Failed to retrieve {policy_type}s: {r.status_code}")
-        return None
-
     try:
-        data = r.json()
-    except ValueError:
-        print('No JSON response body.')
+        return resolve_policy_ids(ENV, BASE_URL, lambda: auth_headers(SCOPES), {policy_type: target_name})[policy_type]
+    except ValueError as e:
+        print(f"⚠️  {e}")
         return None
 
-    key_map = {
-        'fulfillment_policy': 'fulfillmentPolicies',
-        'payment_policy': 'paymentPolicies',
-        'return_policy': 'returnPolicies'
-    }
-
-    id_field_map = {
-        'fulfillment_policy': 'fulfillmentPolicyId',
-        'payment_policy': 'paymentPolicyId',
-        'return_policy': 'returnPolicyId'
-    }
-
-    policies = data.get(key_map.get(policy_type), [])
-    for policy in policies:
-        if policy.get('name') == target_name:
-            return policy.get(id_field_map.get(policy_type))
-
-    print(f"⚠️  No {policy_type} found with name '{target_name}'")
-    return None
-
 def main():
     valid_actions = {'create', 'read', 'delete', 'update', 'enable', 'disable'}
     if len(sys.argv) != 2 or sys.argv[1] not in valid_actions:
@@ -0,0 +1,105 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from local_cache import cache_path, file_sha256, load_json, save_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather  # optional: memory-mapped Arrow files instead of pickles
+except ImportError:
+    pa = feather = None
+
+# Parsing .xlsx is the slow part of every command. The first read of a workbook
+# stores the resulting DataFrame under .cache/sheets/, keyed by the workbook's
+# content hash and the read options; later reads load that instead. The hash is
+# only recomputed when the file's mtime or size changes.
+
+CACHE_VERSION = 1
+
+def index_path():
+    return cache_path('sheets', 'index.json')
+
+def load_index():
+    return load_json(index_path())
+
+def save_index(index):
+    save_json(index_path(), index)
+
+def source_hash(xlsx_path):
+    stat = os.stat(xlsx_path)
+    key = os.path.abspath(xlsx_path)
+    index = load_index()
+    entry = index.get(key)
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['sha256']
+
+    sha = file_sha256(xlsx_path)
+    if entry and entry['sha256'] != sha:
+        for stale in glob.glob(cache_path('sheets', f"{entry['sha256'][:16]}.*")):
+            os.remove(stale)
+    index[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha}
+    save_index(index)
+    return sha
+
+def cache_stem(sha, read_options):
+    options = json.dumps([CACHE_VERSION, pd.__version__, read_options], sort_keys=True, default=str)
+    return cache_path('sheets', f"{sha[:16]}.{hashlib.sha256(options.encode()).hexdigest()[:16]}")
+
+def load_cached(stem):
+    if feather and os.path.exists(stem + '.feather'):
+        df = feather.read_table(stem + '.feather', memory_map=True).to_pandas()
+        # Arrow hands back missing strings as None; read_excel gives NaN
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].where(df[column].notna(), np.nan)
+        return df
+    if os.path.exists(stem + '.pkl'):
+        with open(stem + '.pkl', 'rb') as f:
+            return pickle.load(f)
+    return None
+
+def store(stem, df):
+    if feather:
+        try:
+            feather.write_feather(df, stem + '.feather.tmp', compression='uncompressed')
+            os.replace(stem + '.feather.tmp', stem + '.feather')
+            return
+        except (pa.ArrowException, ValueError, TypeError):
+            # e.g. a column mixing numbers and text; pickle keeps it as is
+            if os.path.exists(stem + '.feather.tmp'):
+                os.remove(stem + '.feather.tmp')
+    with open(stem + '.pkl.tmp', 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(stem + '.pkl.tmp', stem + '.pkl')
+
+def cached_sheet(xlsx_path, **read_options):
+    # The cached DataFrame if this workbook version was read before, else None
+    try:
+        return load_cached(cache_stem(source_hash(xlsx_path), read_options))
+    except Exception:
+        return None
+
+def read_sheet(xlsx_path, **read_options):
+    stem = cache_stem(source_hash(xlsx_path), read_options)
+    try:
+        df = load_cached(stem)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable sheet cache for {xlsx_path}: {e}")
+        df = None
+    if df is not None:
+        return df
+
+    df = pd.read_excel(xlsx_path, **read_options)
+    try:
+        store(stem, df)
+    except OSError as e:
+        print(f"⚠️ Could not cache {xlsx_path}: {e}")
+    return df
+
+def id_index(df, column='id'):
+    # Row position per id; the first row wins, like the old boolean-mask lookup
+    ids = df[column].tolist()
+    return dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# Reads a workbook row by row with openpyxl's read-only mode, so memory stays
+# flat however large the sheet is (estate-sale imports run to hundreds of
+# thousands of rows). Chunks come back as DataFrames shaped like the ones
+# pd.read_excel returns, with a running index across chunks.
+
+CHUNK_SIZE = 10000
+
+# Cell strings pd.read_excel reads as missing by default
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+}
+
+def header_names(header):
+    return [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+
+def cell_value(value):
+    return None if isinstance(value, str) and value in NA_STRINGS else value
+
+def iter_raw_rows(xlsx_path):
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        width = len(header)
+        yield header_names(header)
+        # Like pd.read_excel, keep blank rows between data but drop trailing ones
+        blank = 0
+        for values in rows:
+            values = tuple(cell_value(value) for value in values)
+            if all(value is None for value in values):
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield (None,) * width
+            blank = 0
+            yield values[:width] + (None,) * (width - len(values))
+    finally:
+        workbook.close()
+
+BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+def as_str(value):
+    return value if pd.isna(value) else str(value)
+
+def make_frame(rows, header, dtype, start):
+    dtype = dtype or {}
+    df = pd.DataFrame(rows, columns=header, index=pd.RangeIndex(start, start + len(rows)))
+    df = df.fillna(np.nan).infer_objects()
+    for name in df.columns:
+        if dtype.get(name) is str:
+            df[name] = df[name].map(as_str)
+        elif name not in dtype and not pd.api.types.is_numeric_dtype(df[name]):
+            # pd.read_excel turns numeric- and boolean-looking text columns into
+            # numbers and bools (judged per chunk here rather than per column)
+            values = set(df[name].dropna())
+            if values and values <= set(BOOL_STRINGS) | {True, False}:
+                df[name] = df[name].map(lambda value: BOOL_STRINGS.get(value, value))
+                continue
+            try:
+                df[name] = pd.to_numeric(df[name])
+            except (ValueError, TypeError):
+                pass
+    return df
+
+def iter_chunks(xlsx_path, chunk_size=CHUNK_SIZE, dtype=None):
+    rows = iter_raw_rows(xlsx_path)
+    header = next(rows, None)
+    if header is None:
+        return
+    start = 0
+    chunk = []
+    for values in rows:
+        chunk.append(values)
+        if len(chunk) == chunk_size:
+            yield make_frame(chunk, header, dtype, start)
+            start += len(chunk)
+            chunk = []
+    if chunk or start == 0:
+        yield make_frame(chunk, header, dtype, start)
+
+def find_row(xlsx_path, product_id, column='id'):
+    # Stops reading at the first matching row
+    rows = iter_raw_rows(xlsx_path)
+    header = next(rows, None)
+    if header is None or column not in header:
+        return None
+    position = header.index(column)
+    for index, values in enumerate(rows):
+        if values[position] is not None and str(values[position]) == product_id:
+            rows.close()
+            return make_frame([values], header, {column: str}, index).iloc[0]
+    return None
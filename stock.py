@@ -3,23 +3,42 @@ import os
 import csv
 import json
 import requests
+import ebay_rest
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
-from ebay_config import ENV, SHIPPING_ADDRESS, get_oauth_token_from_refresh_token
+from product_ids import parse_product_ids
+from sheet_cache import read_sheet, cached_sheet, id_index
+from sheet_stream import find_row
+from listing_template import compile_template
+from policy_cache import resolve_policy_ids, id_field
+from inventory_state import InventoryState, payload_hash
+from inventory_bulk import BULK_LIMIT, chunked, format_errors, post_bulk
+from eps_cache import eps_csv_name
+from ebay_config import ENV, SHIPPING_ADDRESS
+from token_cache import auth_headers
 
-OAUTH_TOKEN = get_oauth_token_from_refresh_token([
+SCOPES = [
     'https://api.ebay.com/oauth/api_scope/sell.inventory',
     'https://api.ebay.com/oauth/api_scope/sell.account'
-])
+]
+CONTENT_LANGUAGE = {'Content-Language': 'en-US'}  # inventory item and offer text is US English
 
 BASE_URL = 'https://api.sandbox.ebay.com' if ENV == 'sandbox' else 'https://api.ebay.com'
-HEADERS = {
-    'Authorization': f"Bearer {OAUTH_TOKEN}",
-    'Content-Type': 'application/json',
-    'Content-Language': 'en-US'
+INVENTORY_LOCATION = 'WAREHOUSE'
+CATEGORY = 'diecast'
+LISTING_POLICIES = {
+    'fulfillment_policy': 'standard shipping',
+    'payment_policy': 'standard payment',
+    'return_policy': 'standard return'
 }
 
+try:
+    import lxml  # optional: much faster than the pure-Python html.parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 def safe_json(response):
     try:
         return response.json()
@@ -30,34 +49,55 @@ def print_api_response(action, response):
     data = safe_json(response)
     print(f"{action}: {response.status_code}", data or "(no JSON body)")
 
+def is_success(response):
+    return response is not None and 200 <= response.status_code < 300
+
 def read_image_urls(csv_path):
     with open(csv_path, newline='') as f:
         reader = csv.DictReader(f)
         return [row['eBay_URL'] for row in reader if row.get('eBay_URL')]
 
-def read_description(html_path):
-    with open(html_path, encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
-        body = soup.body
-        description = ''.join(str(child) for child in body.children if child.name) if body else ''
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        description = description + '<p><small>Generated: ' + timestamp + '</small></p>'
-        return description
-
-def read_title_from_html(html_path, max_length=80):
+def parse_listing_html(html, max_title_length=80):
+    # One parse yields both the <title> (listing title) and the <body> markup (description)
+    soup = BeautifulSoup(html, HTML_PARSER)
+    body = soup.body
+    description = ''.join(str(child) for child in body.children if child.name) if body else ''
+    title_tag = soup.title
+    title = title_tag.string.strip()[:max_title_length] if title_tag and title_tag.string else ''
+    return title, description
+
+def read_listing_html(html_path):
     with open(html_path, encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
-        title_tag = soup.title
-        if title_tag and title_tag.string:
-            return title_tag.string.strip()[:max_length]
-        return ''
+        return parse_listing_html(f.read())
+
+# The generated stamp is added when the offer is sent, after the payload hash
+# is taken, so an unchanged offer still hashes the same on the next run.
+def stamp_description(description):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return description + '<p><small>Generated: ' + timestamp + '</small></p>'
+
+def stamped(offer_payload):
+    return dict(offer_payload, listingDescription=stamp_description(offer_payload['listingDescription']))
+
+def read_product_sheet(xlsx_path):
+    return read_sheet(xlsx_path, dtype={'id': str})
+
+def find_product(df, product_id, index=None):
+    position = (id_index(df) if index is None else index).get(product_id)
+    if position is None:
+        raise ValueError(f"No entry for product_id {product_id} in pricing file.")
+    return df.iloc[position]
 
 def read_product_data(xlsx_path, product_id):
-    df = pd.read_excel(xlsx_path, dtype={'id': str})
-    row = df[df['id'] == product_id]
-    if row.empty:
+    # A single product comes from the sheet cache when there is one, otherwise
+    # by streaming the workbook up to its row instead of loading all of it
+    df = cached_sheet(xlsx_path, dtype={'id': str})
+    if df is not None:
+        return find_product(df, product_id)
+    row = find_row(xlsx_path, product_id)
+    if row is None:
         raise ValueError(f"No entry for product_id {product_id} in pricing file.")
-    return row.iloc[0]
+    return row
 
 def create_inventory_location(location_key):
     payload = {
@@ -67,12 +107,19 @@ def create_inventory_location(location_key):
         },
         'merchantLocationStatus': 'ENABLED'
     }
-    r = requests.post(f"{BASE_URL}/sell/inventory/v1/location/{location_key}", headers=HEADERS, json=payload)
+    r = ebay_rest.post(f"{BASE_URL}/sell/inventory/v1/location/{location_key}", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE), json=payload)
     print_api_response(f"Inventory location '{location_key}' create/update", r)
 
-def create_inventory_item(sku, title, image_urls, product_info):
+def aspect_value(value):
+    # A whole-column read makes an int column with blanks float (2005.0) while
+    # a streamed single row keeps 2005; both must give the same aspect text
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def build_inventory_item_payload(title, image_urls, product_info):
     weight = product_info['lbs'] * 16 + product_info['oz']
-    payload = {
+    return {
         'availability': {
             'pickupAtLocationAvailability': [],
             'shipToLocationAvailability': {
@@ -84,7 +131,7 @@ def create_inventory_item(sku, title, image_urls, product_info):
         'product': {
             'title': title,
             'aspects': {
-                k: [str(v)] for k, v in {
+                k: [aspect_value(v)] for k, v in {
                     'Organization': 'NASCAR',
                     'Material': 'Diecast',
                     'Scale': product_info.get('scale'),
@@ -111,47 +158,20 @@ def create_inventory_item(sku, title, image_urls, product_info):
             }
         }
     }
-    r = requests.put(f"{BASE_URL}/sell/inventory/v1/inventory_item/{sku}", headers=HEADERS, json=payload)
-    print_api_response('Create Inventory Item', r)
-
-def get_policy_id_by_name(policy_type, name):
-    url = f"{BASE_URL}/sell/account/v1/{policy_type}_policy?marketplace_id=EBAY_US"
-    r = requests.get(url, headers=HEADERS)
-    if r.status_code != 200:
-        raise Exception(f"Failed to fetch {policy_type} policies: {r.status_code} - {r.text}")
-
-    policies = safe_json(r).get(f"{policy_type}Policies", [])
-    for policy in policies:
-        if policy['name'].lower() == name.lower():
-            return policy[f"{policy_type}PolicyId"]
-    raise ValueError(f"{policy_type.capitalize()} policy named '{name}' not found.")
-
-def create_or_update_offer(sku, description_html, product_info, inventory_location):
-    get_url = f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}"
-    get_resp = requests.get(get_url, headers=HEADERS)
-    offers = safe_json(get_resp).get('offers', [])
-    offer_exists = len(offers) > 0
 
-    try:
-        FULFILLMENT_POLICY_ID = get_policy_id_by_name('fulfillment', 'standard shipping')
-        PAYMENT_POLICY_ID = get_policy_id_by_name('payment', 'standard payment')
-        RETURN_POLICY_ID = get_policy_id_by_name('return', 'standard return')
-    except ValueError as e:
-        print(f"❌ Policy lookup failed: {e}")
-        return
+def get_listing_policy_ids():
+    ids = resolve_policy_ids(ENV, BASE_URL, lambda: auth_headers(SCOPES, **CONTENT_LANGUAGE), LISTING_POLICIES)
+    return {id_field(policy_type): policy_id for policy_type, policy_id in ids.items()}
 
-    payload = {
+def build_offer_payload(sku, description_html, product_info, inventory_location, policy_ids):
+    return {
         'sku': sku,
         'marketplaceId': 'EBAY_US',
         'format': 'FIXED_PRICE',
         'availableQuantity': 1,
         'categoryId': '180272',
         'listingDuration': 'GTC',
-        'listingPolicies': {
-            'fulfillmentPolicyId': FULFILLMENT_POLICY_ID,
-            'paymentPolicyId': PAYMENT_POLICY_ID,
-            'returnPolicyId': RETURN_POLICY_ID
-        },
+        'listingPolicies': dict(policy_ids),
         'listingDescription': description_html,
         'pricingSummary': {
             'price': {
@@ -162,43 +182,310 @@ def create_or_update_offer(sku, description_html, product_info, inventory_locati
         'merchantLocationKey': inventory_location
     }
 
-    if offer_exists:
-        offer_id = offers[0]['offerId']
-        update_url = f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}"
-        r = requests.put(update_url, headers=HEADERS, json=payload)
+def lookup_offer_id(sku):
+    r = ebay_rest.get(f"{BASE_URL}/sell/inventory/v1/offer?sku={sku}", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE))
+    offers = safe_json(r).get('offers', [])
+    return offers[0]['offerId'] if offers else None
+
+def send_offer(sku, payload, offer_id=None):
+    # offer_id comes from the local state store when known; a stale id (404)
+    # falls back to looking the offer up by SKU.
+    if offer_id:
+        r = ebay_rest.put(f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE), json=stamped(payload))
+        if r.status_code != 404:
+            print_api_response('Update Offer', r)
+            return r, offer_id
+
+    offer_id = lookup_offer_id(sku)
+    if offer_id:
+        r = ebay_rest.put(f"{BASE_URL}/sell/inventory/v1/offer/{offer_id}", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE), json=stamped(payload))
         action = 'Update'
     else:
-        create_url = f"{BASE_URL}/sell/inventory/v1/offer"
-        r = requests.post(create_url, headers=HEADERS, json=payload)
+        r = ebay_rest.post(f"{BASE_URL}/sell/inventory/v1/offer", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE), json=stamped(payload))
+        offer_id = safe_json(r).get('offerId')
         action = 'Create'
 
     print_api_response(f"{action} Offer", r)
+    return r, offer_id
+
+def push_product(product_id, product_info, description_html, title, image_urls, policy_ids=None, state=None, force=False):
+    sku = f"DIECAST-{product_id}"
+    record = (state.get(sku) if state else None) or {}
+    if record.get('sold_at'):
+        # Pushing the item would set its quantity back to 1 and relist a sold car
+        print(f"❌ {sku} is marked as sold; clear it with orders.sync.py --unmark {product_id} to relist")
+        return False
+
+    item_payload = build_inventory_item_payload(title, image_urls, product_info)
+    item_hash = payload_hash(item_payload)
+    if force or record.get('item_hash') != item_hash:
+        r = ebay_rest.put(f"{BASE_URL}/sell/inventory/v1/inventory_item/{sku}", headers=auth_headers(SCOPES, **CONTENT_LANGUAGE), json=item_payload)
+        print_api_response('Create Inventory Item', r)
+        if not is_success(r):
+            return False
+        if state:
+            state.update(sku, item_hash=item_hash)
+    else:
+        print(f"⏭️  Inventory item [{sku}] unchanged, skipped")
+
+    if policy_ids is None:
+        try:
+            policy_ids = get_listing_policy_ids()
+        except ValueError as e:
+            print(f"❌ Policy lookup failed: {e}")
+            return False
+
+    offer_payload = build_offer_payload(sku, description_html, product_info, INVENTORY_LOCATION, policy_ids)
+    offer_hash = payload_hash(offer_payload)
+    if not force and record.get('offer_hash') == offer_hash and record.get('offer_id'):
+        print(f"⏭️  Offer [{sku}] unchanged, skipped")
+        return True
+
+    r, offer_id = send_offer(sku, offer_payload, record.get('offer_id'))
+    if not is_success(r):
+        return False
+    if state:
+        state.update(sku, offer_hash=offer_hash, offer_id=offer_id)
+    return True
+
+def bulk_create_or_replace_inventory_items(items):
+    # items: {sku: inventory item payload}; returns {sku: (ok, message)}
+    results = {}
+    skus = list(items)
+    for chunk in chunked(skus):
+        batch = [dict(items[sku], sku=sku, locale='en_US') for sku in chunk]
+        responses, error = post_bulk(BASE_URL, auth_headers(SCOPES, **CONTENT_LANGUAGE), 'bulk_create_or_replace_inventory_item', batch)
+        if error:
+            results.update({sku: (False, error) for sku in chunk})
+            continue
+        for entry in responses:
+            ok = entry.get('statusCode') in {200, 201, 204}
+            results[entry.get('sku')] = (ok, 'inventory item saved' if ok else format_errors(entry))
+    for sku in skus:
+        results.setdefault(sku, (False, 'no response for SKU in bulk inventory item call'))
+    return results
+
+def existing_offer_id(entry):
+    for error in entry.get('errors') or []:
+        for param in error.get('parameters') or []:
+            if param.get('name') == 'offerId':
+                return param.get('value')
+    return None
+
+def update_offer(sku, offer_id, payload):
+    r, offer_id = send_offer(sku, payload, offer_id)
+    if is_success(r):
+        return True, offer_id, 'offer updated'
+    if not offer_id:
+        return False, None, f"offer create failed ({r.status_code}): {format_errors(safe_json(r))}"
+    return False, offer_id, f"offer update failed: {format_errors(safe_json(r))}"
+
+def bulk_create_or_update_offers(offers):
+    # offers: {sku: offer payload}; returns {sku: (ok, offer_id, message)}
+    # bulk_create_offer rejects SKUs that already have an offer, naming the
+    # existing offerId; those fall back to a single PUT against that offer.
+    results = {}
+    skus = list(offers)
+    for chunk in chunked(skus):
+        responses, error = post_bulk(BASE_URL, auth_headers(SCOPES, **CONTENT_LANGUAGE), 'bulk_create_offer', [stamped(offers[sku]) for sku in chunk])
+        if error:
+            results.update({sku: (False, None, error) for sku in chunk})
+            continue
+        for entry in responses:
+            sku = entry.get('sku')
+            if entry.get('statusCode') in {200, 201}:
+                results[sku] = (True, entry.get('offerId'), 'offer created')
+            elif sku in offers and existing_offer_id(entry):
+                results[sku] = update_offer(sku, existing_offer_id(entry), offers[sku])
+            elif sku in offers:
+                results[sku] = (False, None, f"offer create failed: {format_errors(entry)}")
+    for sku in skus:
+        results.setdefault(sku, (False, None, 'no response for SKU in bulk offer call'))
+    return results
+
+def bulk_publish_offers(offer_ids):
+    # offer_ids: {sku: offer_id}; returns {sku: (ok, listing_id, message)}
+    results = {}
+    sku_by_offer = {offer_id: sku for sku, offer_id in offer_ids.items()}
+    for chunk in chunked(list(sku_by_offer)):
+        responses, error = post_bulk(BASE_URL, auth_headers(SCOPES, **CONTENT_LANGUAGE), 'bulk_publish_offer', [{'offerId': offer_id} for offer_id in chunk])
+        if error:
+            results.update({sku_by_offer[offer_id]: (False, None, error) for offer_id in chunk})
+            continue
+        for entry in responses:
+            sku = sku_by_offer.get(entry.get('offerId'))
+            if entry.get('statusCode') == 200:
+                results[sku] = (True, entry.get('listingId'), f"published as listing {entry.get('listingId')}")
+            else:
+                results[sku] = (False, None, f"publish failed: {format_errors(entry)}")
+    for sku in offer_ids:
+        results.setdefault(sku, (False, None, 'no response for offer in bulk publish call'))
+    return results
+
+def description_path(product_id):
+    return f"{CATEGORY}.listing.{str(product_id).zfill(3)}.html"
+
+def run_batch(xlsx_path, id_spec, publish=False, force=False, template_path=None):
+    # Raises ValueError for a bad selection or policy lookup; the CLI exits on it
+    df = read_product_sheet(xlsx_path)
+    index = id_index(df)
+    product_ids = parse_product_ids(id_spec, available=df['id'].dropna())
+    if not product_ids:
+        raise ValueError("No product ids selected.")
+
+    try:
+        policy_ids = get_listing_policy_ids()
+    except ValueError as e:
+        raise ValueError(f"Policy lookup failed: {e}")
+    create_inventory_location(INVENTORY_LOCATION)
+
+    template = None
+    if template_path:
+        with open(template_path, encoding='utf-8') as f:
+            template = compile_template(f.read())
+
+    state = InventoryState(ENV)
+    sold = state.sold_skus()  # marked by orders.sync.py
+    results = {}
+    items = {}
+    offers = {}
+    hashes = {}
+    records = {}
+    for product_id in product_ids:
+        sku = f"DIECAST-{product_id}"
+        if sku in sold:
+            results[sku] = f"skipped (sold {sold[sku][:10]})"
+            continue
+        csv_path = eps_csv_name(CATEGORY, product_id, ENV)
+        html_path = description_path(product_id)
+        # With a template the description is rendered in memory from the same sheet
+        required = [csv_path] if template else [csv_path, html_path]
+        missing = [path for path in required if not os.path.exists(path)]
+        if missing:
+            results[sku] = f"skipped (missing {', '.join(missing)})"
+            continue
+        try:
+            product_info = find_product(df, product_id, index)
+        except ValueError:
+            results[sku] = 'skipped (not in pricing file)'
+            continue
+
+        if template:
+            title, description_html = parse_listing_html(template.render_row(product_info))
+        else:
+            title, description_html = read_listing_html(html_path)
+        items[sku] = build_inventory_item_payload(title, read_image_urls(csv_path), product_info)
+        offers[sku] = build_offer_payload(sku, description_html, product_info, INVENTORY_LOCATION, policy_ids)
+        hashes[sku] = (payload_hash(items[sku]), payload_hash(offers[sku]))
+        records[sku] = {} if force else (state.get(sku) or {})
+
+    changed_items = {sku: payload for sku, payload in items.items() if records[sku].get('item_hash') != hashes[sku][0]}
+    print(f"📦 Pushing {len(changed_items)} of {len(items)} inventory item(s) in batches of {BULK_LIMIT}")
+    offer_ids = {sku: records[sku].get('offer_id') for sku in items if records[sku].get('offer_id')}
+    try:
+        item_results = bulk_create_or_replace_inventory_items(changed_items)
+        for sku, (ok, message) in item_results.items():
+            if ok:
+                state.update(sku, item_hash=hashes[sku][0])
+            else:
+                results[sku] = f"failed ({message})"
+
+        ready = [sku for sku in items if sku not in results]
+        unchanged = [sku for sku in ready if records[sku].get('offer_hash') == hashes[sku][1] and sku in offer_ids]
+        known = [sku for sku in ready if sku not in unchanged and sku in offer_ids]
+        new = {sku: offers[sku] for sku in ready if sku not in unchanged and sku not in offer_ids}
+        print(f"🏷️  Offers: {len(new)} new, {len(known)} changed, {len(unchanged)} unchanged")
+
+        offer_results = bulk_create_or_update_offers(new)
+        for sku in known:
+            offer_results[sku] = update_offer(sku, offer_ids[sku], offers[sku])
+        for sku, (ok, offer_id, message) in offer_results.items():
+            if ok:
+                offer_ids[sku] = offer_id
+                state.update(sku, offer_hash=hashes[sku][1], offer_id=offer_id)
+            else:
+                offer_ids.pop(sku, None)
+                results[sku] = f"failed ({message})"
+        for sku in ready:
+            results.setdefault(sku, 'ok')
+
+        if publish:
+            to_publish = {sku: offer_ids[sku] for sku in ready if results[sku] == 'ok'
+                          and (sku in offer_results or not records[sku].get('listing_id'))}
+            for sku, (ok, listing_id, message) in bulk_publish_offers(to_publish).items():
+                if ok:
+                    state.update(sku, listing_id=listing_id)
+                results[sku] = 'ok' if ok else f"failed ({message})"
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error during bulk push: {e}")
+        for sku in items:
+            results.setdefault(sku, f"failed ({e})")
+    finally:
+        state.close()
+
+    print_batch_summary(results)
+    return results
+
+def print_batch_summary(results):
+    succeeded = sum(1 for status in results.values() if status == 'ok')
+    skipped = sum(1 for status in results.values() if status.startswith('skipped'))
+    print(f"\n🧾 Batch summary: {succeeded}/{len(results) - skipped} succeeded" + (f", {skipped} sold skipped" if skipped else ''))
+    for sku, status in results.items():
+        icon = '✅' if status == 'ok' else 'ℹ️ ' if status.startswith('skipped') else '❌'
+        print(f"  {icon} {sku}: {status}")
 
 def main():
-    if len(sys.argv) != 5:
+    args = [arg for arg in sys.argv[1:] if arg != '--force']
+    force = len(args) != len(sys.argv) - 1
+
+    if len(args) >= 3 and args[0] == 'batch':
+        options = args[3:]
+        template_path = None
+        if '--template' in options:
+            index = options.index('--template')
+            if index + 1 >= len(options):
+                sys.exit("❌ --template needs a template file")
+            template_path = options.pop(index + 1)
+            options.pop(index)
+        unknown = [arg for arg in options if arg != '--publish']
+        if unknown:
+            sys.exit(f"❌ Unknown option: {unknown[0]}")
+        xlsx_path = args[1]
+        for path in [xlsx_path, template_path]:
+            if path and not os.path.exists(path):
+                sys.exit(f"❌ File not found: {path}")
+        try:
+            run_batch(xlsx_path, args[2], '--publish' in options, force, template_path)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        return
+
+    if len(args) != 4:
         script = os.path.basename(__file__)
-        print(f"Usage: python {script} <product.xlsx> <eps.csv> <description.html> <product_id>")
+        print(f"Usage: python {script} <product.xlsx> <eps.csv> <description.html> <product_id> [--force]")
+        print(f"       python {script} batch <product.xlsx> <product_ids|first-last|all|@ids.txt> [--template template.html] [--publish] [--force]")
         sys.exit(1)
 
-    xlsx_path = sys.argv[1]
-    csv_path = sys.argv[2]
-    html_path = sys.argv[3]
-    product_id = sys.argv[4]
+    xlsx_path, csv_path, html_path, product_id = args
 
     for path in [xlsx_path, csv_path, html_path]:
         if not os.path.exists(path):
             sys.exit(f"❌ File not found: {path}")
 
-    sku = f"DIECAST-{product_id}"
+    state = InventoryState(ENV)
+    if (state.get(f"DIECAST-{product_id}") or {}).get('sold_at'):
+        state.close()
+        sys.exit(f"❌ DIECAST-{product_id} is marked as sold; clear it with orders.sync.py --unmark {product_id} to relist")
+
     product_info = read_product_data(xlsx_path, product_id)
-    description_html = read_description(html_path)
-    title = read_title_from_html(html_path)
+    title, description_html = read_listing_html(html_path)
     image_urls = read_image_urls(csv_path)
-    inventory_location = 'WAREHOUSE'
 
-    create_inventory_location(inventory_location)
-    create_inventory_item(sku, title, image_urls, product_info)
-    create_or_update_offer(sku, description_html, product_info, inventory_location)
+    create_inventory_location(INVENTORY_LOCATION)
+    try:
+        push_product(product_id, product_info, description_html, title, image_urls, state=state, force=force)
+    finally:
+        state.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import sys
+import boto3
+import pytest
+from moto import mock_aws
+
+# S3Sync against moto's in-memory S3: paginated listings, multipart ETags and
+# the s3.<category>.<id>.urls.txt files.
+#   pip install pytest moto && python3 -m pytest tests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from s3_sync import PART_SIZE, REGION, S3Sync, s3_etag
+
+BUCKET = 'ebay.photos.test'
+CATEGORY = 'diecast'
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with mock_aws():
+        client = boto3.client('s3', region_name=REGION)
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Sync(BUCKET, client=client, state_path=str(tmp_path / 'state.json'))
+
+def write_photo(product_id, filename, size):
+    folder = os.path.join('photos', CATEGORY, product_id)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, filename)
+    with open(path, 'wb') as f:
+        f.write(os.urandom(size))
+    return path
+
+def test_listing_follows_pages(sync):
+    # list_objects_v2 returns at most 1,000 keys per page
+    for n in range(1005):
+        sync.client.put_object(Bucket=BUCKET, Key=f"{CATEGORY}/{n // 100:03d}/{n}.jpg", Body=b'x')
+    sync.client.put_object(Bucket=BUCKET, Key='other/001/1.jpg', Body=b'x')
+
+    objects = sync.list_prefix(f"{CATEGORY}/")
+    assert len(objects) == 1005
+    assert all(key.startswith(f"{CATEGORY}/") for key in objects)
+
+def test_listing_is_cached_until_refresh(sync):
+    sync.client.put_object(Bucket=BUCKET, Key=f"{CATEGORY}/001/1.jpg", Body=b'x')
+    assert len(sync.list_prefix(f"{CATEGORY}/")) == 1
+    sync.client.put_object(Bucket=BUCKET, Key=f"{CATEGORY}/001/2.jpg", Body=b'x')
+    assert len(sync.list_prefix(f"{CATEGORY}/")) == 1
+    assert len(sync.list_prefix(f"{CATEGORY}/", refresh=True)) == 2
+
+def test_upload_skips_unchanged_multipart_files(sync):
+    large = write_photo('001', '1.jpg', PART_SIZE + 1024)
+    write_photo('001', '2.jpg', 1024)
+
+    results = sync.upload('photos', CATEGORY, ['001'], workers=2)
+    assert sorted(results['uploaded']) == [f"{CATEGORY}/001/1.jpg", f"{CATEGORY}/001/2.jpg"]
+    assert results['failed'] == []
+
+    # The multipart ETag S3 reports matches the one computed locally
+    head = sync.client.head_object(Bucket=BUCKET, Key=f"{CATEGORY}/001/1.jpg")
+    assert head['ETag'].strip('"') == s3_etag(large)
+    assert s3_etag(large).endswith('-2')
+
+    # A fresh instance (new process) lists the bucket and uploads nothing
+    again = S3Sync(BUCKET, client=sync.client, state_path=sync.state_path).upload('photos', CATEGORY, ['001'])
+    assert again == {'uploaded': [], 'skipped': 2, 'failed': []}
+
+    write_photo('001', '2.jpg', 2048)
+    changed = sync.upload('photos', CATEGORY, ['001'])
+    assert changed['uploaded'] == [f"{CATEGORY}/001/2.jpg"]
+    assert changed['skipped'] == 1
+
+def test_url_files(sync):
+    for key in (f"{CATEGORY}/001/2.jpg", f"{CATEGORY}/001/1.jpg", f"{CATEGORY}/002/1.jpg"):
+        sync.client.put_object(Bucket=BUCKET, Key=key, Body=b'x')
+
+    keys = sync.product_keys(CATEGORY)
+    written = sync.write_url_files(CATEGORY, ['001', '002', '003'], keys)
+
+    assert written == {
+        '001': (f"s3.{CATEGORY}.001.urls.txt", 2),
+        '002': (f"s3.{CATEGORY}.002.urls.txt", 1),
+        '003': (f"s3.{CATEGORY}.003.urls.txt", 0)
+    }
+    with open(f"s3.{CATEGORY}.001.urls.txt", encoding='utf-8') as f:
+        assert f.read().splitlines() == [
+            f"https://s3.{REGION}.amazonaws.com/{BUCKET}/{CATEGORY}/001/1.jpg",
+            f"https://s3.{REGION}.amazonaws.com/{BUCKET}/{CATEGORY}/001/2.jpg"
+        ]
+    with open(f"s3.{CATEGORY}.003.urls.txt", encoding='utf-8') as f:
+        assert f.read() == ''
@@ -0,0 +1,67 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from local_cache import cache_path, load_json, save_json
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an unlocked cache
+    fcntl = None
+
+# Refresh a little before eBay's expires_in so a token never expires mid-run
+REFRESH_MARGIN = 300
+
+# Tokens this process already read, so callers can ask for the token before
+# every request without touching the cache file each time
+_memory = {}
+
+def cache_key(env, scopes, account=''):
+    # account (app id + refresh token) is hashed so a re-auth or another seller
+    # in the same env never gets the previous account's token
+    account_hash = hashlib.sha256(account.encode('utf-8')).hexdigest()[:12]
+    return f"{env}|{account_hash}|{' '.join(sorted(scopes))}"
+
+@contextmanager
+def locked(lock_path):
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def get_cached_token(env, scopes, fetch, path=None, account=''):
+    # fetch() must return eBay's token response: {'access_token': ..., 'expires_in': ...}
+    path = path or cache_path('oauth.tokens.json')
+    key = cache_key(env, scopes, account)
+    entry = _memory.get((path, key))
+    if entry and entry['expires_at'] - REFRESH_MARGIN > time.time():
+        return entry['access_token']
+    with locked(f"{path}.lock"):
+        tokens = load_json(path)
+        entry = tokens.get(key)
+        if entry and entry.get('expires_at', 0) - REFRESH_MARGIN > time.time():
+            _memory[(path, key)] = entry
+            return entry['access_token']
+
+        token_data = fetch()
+        tokens = {k: v for k, v in tokens.items() if v.get('expires_at', 0) > time.time()}
+        tokens[key] = {
+            'access_token': token_data['access_token'],
+            'expires_at': time.time() + int(token_data.get('expires_in', 7200))
+        }
+        save_json(path, tokens, mode=0o600)  # access tokens: owner only
+        _memory[(path, key)] = tokens[key]
+        return token_data['access_token']
+
+def auth_headers(scopes, **extra):
+    # Call per request instead of caching the headers: the cached token is
+    # swapped for a fresh one once it nears expiry
+    from ebay_config import get_oauth_token_from_refresh_token  # ebay_config imports this module
+    return {
+        'Authorization': f"Bearer {get_oauth_token_from_refresh_token(scopes)}",
+        'Content-Type': 'application/json',
+        **extra
+    }